@@ -0,0 +1,61 @@
+"""
+benchmark_tcpdump.py
+Mesure le coût de l'extraction des lignes tcpdump (regex + conversion des adresses)
+Compare l'ancienne regex IPv4 seule avec la regex IP/IP6 sur du trafic IPv4 pur et mixte v4/v6
+Usage : python benchmark_tcpdump.py [nombre_de_lignes]
+"""
+
+import re
+import sys
+import time
+
+from outils_reseau import REGEX_FLAGS, separer_adresse_port, ip_vers_entier
+
+# Regex d'origine (IPv4 uniquement), gardée comme référence
+REGEX_IPV4 = re.compile(r"(\S+) IP ([\w\.-]+) > ([\w\.-]+): Flags \[(.*?)\]")
+
+
+def generer_lignes(nombre, part_ipv6):
+    """Génère des lignes tcpdump synthétiques (part_ipv6 : proportion de lignes IP6)"""
+    lignes = []
+    pas_ipv6 = int(1 / part_ipv6) if part_ipv6 else 0
+    for i in range(nombre):
+        if pas_ipv6 and i % pas_ipv6 == 0:
+            lignes.append(f"14:03:22.{i % 1000000:06d} IP6 2001:db8:{i % 50:x}::{i % 250 + 1:x}.{40000 + i % 1000} > "
+                          f"2001:db8::1.443: Flags [S], seq {i}, win 1024, length 0\n")
+        else:
+            lignes.append(f"14:03:22.{i % 1000000:06d} IP 192.168.{i % 50}.{i % 250 + 1}.{40000 + i % 1000} > "
+                          f"10.0.0.1.22: Flags [S.], seq {i}, win 1024, length 0\n")
+    return lignes
+
+
+def mesurer(regex, lignes, conversion=True):
+    """Retourne (durée en secondes, nombre de lignes reconnues)"""
+    ip_vers_entier.cache_clear()
+    separer_adresse_port.cache_clear()
+    reconnues = 0
+    debut = time.perf_counter()
+    for ligne in lignes:
+        match = regex.search(ligne)
+        if not match: continue
+        reconnues += 1
+        if conversion:
+            groupes = match.groups()  # La regex IP/IP6 a un groupe de plus (date -tttt)
+            src_raw, dst_raw = groupes[-3], groupes[-2]
+            ip_vers_entier(separer_adresse_port(src_raw)[0])
+            ip_vers_entier(separer_adresse_port(dst_raw)[0])
+    return time.perf_counter() - debut, reconnues
+
+
+if __name__ == "__main__":
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print(f"=== Benchmark extraction tcpdump ({nombre} lignes) ===\n")
+    print(f"{'Jeu de données':<22} {'Regex':<10} {'Durée (s)':>10} {'Lignes/s':>12} {'Reconnues':>10}")
+    print("-" * 68)
+
+    for nom, part in [("IPv4 seul", 0), ("Mixte 80/20 v4/v6", 0.2), ("Mixte 50/50 v4/v6", 0.5)]:
+        lignes = generer_lignes(nombre, part)
+        for nom_regex, regex in [("IPv4", REGEX_IPV4), ("IP/IP6", REGEX_FLAGS)]:
+            duree, reconnues = mesurer(regex, lignes)
+            print(f"{nom:<22} {nom_regex:<10} {duree:>10.3f} {nombre / duree:>12.0f} {reconnues:>10}")
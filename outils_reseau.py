@@ -0,0 +1,325 @@
+"""
+outils_reseau.py
+Fonctions partagées par les analyseurs tcpdump (python tcp.py et python tcp (markdown).py)
+Normalisation des adresses IP en entiers (32 bits IPv4 / 128 bits IPv6) et agrégation CIDR
+"""
+
+import ipaddress
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+
+# Regex tcpdump (timestamp IP/IP6 src > dst: ...), partagées par les deux analyseurs
+# 'IP6?' ne coûte qu'un caractère optionnel : le chemin IPv4 reste une seule passe sans branche
+# Les adresses IPv6 contiennent des ':' (et '%' pour l'interface, ex: fe80::1%eth0)
+# La date optionnelle en tête correspond au format tcpdump -tttt (2025-12-10 14:03:22.123456)
+REGEX_FLAGS = re.compile(r"(?:(\d{4}-\d\d-\d\d) )?(\S+) IP6? ([\w\.:%-]+) > ([\w\.:%-]+): Flags \[(.*?)\]")
+REGEX_INFO = re.compile(r"(?:(\d{4}-\d\d-\d\d) )?(\S+) IP6? ([\w\.:%-]+) > ([\w\.:%-]+): (.*)")
+
+
+@lru_cache(maxsize=65536)
+def ip_vers_entier(ip):
+    """
+    Convertit une adresse texte en clé compacte (version, entier)
+    Exemple: '192.168.1.12' -> (4, 3232235788)
+    Retourne le texte tel quel si ce n'est pas une adresse IP (nom d'hôte résolu par tcpdump)
+    Le cache évite de re-analyser les adresses qui reviennent à chaque paquet
+    """
+    parties = ip.split('.')
+    # Chemin rapide IPv4 : 4 nombres séparés par des points
+    if len(parties) == 4 and all(p.isdigit() for p in parties):
+        a, b, c, d = (int(p) for p in parties)
+        if a < 256 and b < 256 and c < 256 and d < 256:
+            return (4, (a << 24) | (b << 16) | (c << 8) | d)
+        return ip
+
+    if ':' in ip:
+        try:
+            return (6, int(ipaddress.IPv6Address(ip)))
+        except ValueError:
+            return ip
+
+    return ip
+
+
+@lru_cache(maxsize=65536)
+def separer_adresse_port(extremite):
+    """
+    Sépare une extrémité tcpdump en (adresse, port ou service)
+    Exemples: '192.168.1.5.80' -> ('192.168.1.5', '80'), '10.0.0.1.domain' -> ('10.0.0.1', 'domain'),
+              '10.0.0.1' -> ('10.0.0.1', '') (ICMP, pas de port),
+              '::ffff:10.0.0.1' -> ('::ffff:10.0.0.1', '') (IPv4 dans une IPv6, pas de port)
+    """
+    p = extremite.rsplit('.', 1)
+    if len(p) < 2:
+        return (extremite, "")
+    reste = p[0]
+    # On ne sépare le dernier morceau que si ce qui reste est une adresse complète
+    if ':' in reste:
+        # IPv6 : une IPv4 intégrée à la fin (::ffff:10.0.0.1) doit garder ses 4 nombres
+        queue = reste.rsplit(':', 1)[1]
+        if '.' in queue and queue.count('.') < 3:
+            return (extremite, "")
+    elif reste.replace('.', '').isdigit() and reste.count('.') < 3:
+        # IPv4 seule (3 points) : le dernier nombre fait partie de l'adresse
+        return (extremite, "")
+    return (reste, p[1])
+
+
+@lru_cache(maxsize=4096)
+def debut_heure(annee, mois, jour, heure):
+    """
+    Retourne l'epoch (heure locale) du début d'une heure, calculé une fois par heure
+    time.mktime normalise le jour (32 décembre -> 1er janvier) et applique le changement d'heure du jour
+    """
+    return time.mktime((annee, mois, jour, heure, 0, 0, 0, 0, -1))
+
+
+class LecteurHorodatage:
+    """
+    Convertit les horodatages tcpdump en epoch (float, secondes)
+    Formats acceptés :
+    - tcpdump -tttt : date '2025-12-10' + heure '14:03:22.123456'
+    - tcpdump par défaut : heure seule '14:03:22.123456', la date est déduite de la référence
+      (un retour en arrière de plus de 12h est interprété comme un passage à minuit)
+    - tcpdump -tt : epoch direct '1765371802.123456'
+    Référence : date_reference ('AAAA-MM-JJ', jour du premier paquet) ou fin_capture (epoch de la fin
+    de la capture, ex: date de modification du fichier). Avec fin_capture, la capture est supposée durer
+    moins de 24h : si le premier paquet est plus tard dans la journée que la fin, il date de la veille
+    """
+
+    def __init__(self, date_reference=None, fin_capture=None):
+        if fin_capture is not None:
+            fin = time.localtime(fin_capture)
+            self.jour = (fin.tm_year, fin.tm_mon, fin.tm_mday)
+            self.seconde_fin = fin.tm_hour * 3600 + fin.tm_min * 60 + fin.tm_sec
+        else:
+            self.jour = (int(date_reference[0:4]), int(date_reference[5:7]), int(date_reference[8:10]))
+            self.seconde_fin = None
+        self.decalage_jours = None
+        self.derniere_seconde = 0.0
+
+    def __call__(self, date_texte, heure):
+        # Lecture à positions fixes HH:MM:SS.ffffff (pas de regex ni de strptime)
+        if len(heure) >= 8 and heure[2] == ':' and heure[5] == ':':
+            heures = int(heure[0:2])
+            secondes = int(heure[3:5]) * 60 + float(heure[6:])
+        else:
+            try:
+                return float(heure)
+            except ValueError:
+                return None
+
+        if date_texte:
+            return debut_heure(int(date_texte[0:4]), int(date_texte[5:7]), int(date_texte[8:10]), heures) + secondes
+
+        seconde_du_jour = heures * 3600 + secondes
+        if self.decalage_jours is None:
+            # Premier paquet : avec la fin de capture pour référence, il peut dater de la veille
+            self.decalage_jours = -1 if self.seconde_fin is not None and seconde_du_jour > self.seconde_fin else 0
+        elif seconde_du_jour < self.derniere_seconde - 43200:
+            self.decalage_jours += 1
+        self.derniere_seconde = seconde_du_jour
+        annee, mois, jour = self.jour
+        return debut_heure(annee, mois, jour + self.decalage_jours, heures) + secondes
+
+
+# Ports connus -> nom de service (mêmes noms que tcpdump sans -n, sauf rdp)
+SERVICES_PORTS = {
+    20: 'ftp-data', 21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp', 53: 'domain', 67: 'bootps',
+    68: 'bootpc', 69: 'tftp', 80: 'http', 110: 'pop3', 123: 'ntp', 137: 'netbios-ns',
+    138: 'netbios-dgm', 139: 'netbios-ssn', 143: 'imap', 161: 'snmp', 162: 'snmptrap',
+    179: 'bgp', 389: 'ldap', 443: 'https', 445: 'microsoft-ds', 465: 'smtps', 500: 'isakmp',
+    514: 'syslog', 587: 'submission', 636: 'ldaps', 853: 'domain-s', 993: 'imaps', 995: 'pop3s',
+    1194: 'openvpn', 1433: 'ms-sql-s', 1521: 'oracle', 1812: 'radius', 1883: 'mqtt',
+    2049: 'nfs', 3306: 'mysql', 3389: 'rdp', 5060: 'sip', 5353: 'mdns', 5432: 'postgresql',
+    5900: 'vnc', 6379: 'redis', 8080: 'http-alt', 8443: 'https-alt',
+}
+
+# Table indexée par numéro de port : une seule lecture de liste par extrémité, sans DNS ni getservbyport
+TABLE_SERVICES = [""] * 65536
+for _port, _nom in SERVICES_PORTS.items():
+    TABLE_SERVICES[_port] = _nom
+
+
+def nom_service(port):
+    """
+    Retourne le nom du service d'un port tcpdump
+    Les ports numériques (captures en -n / -nn) sont résolus par TABLE_SERVICES ('22' -> 'ssh')
+    Un nom déjà résolu par tcpdump (ex: 'domain') est renvoyé tel quel ; port inconnu -> ''
+    """
+    if port.isdigit():
+        numero = int(port)
+        return TABLE_SERVICES[numero] if numero < 65536 else ""
+    return port
+
+
+@lru_cache(maxsize=None)
+def masque(version, longueur):
+    """Retourne le masque réseau (entier) pour une longueur de préfixe donnée"""
+    bits = 32 if version == 4 else 128
+    return ((1 << longueur) - 1) << (bits - longueur)
+
+
+def reseau(adresse, prefixe_v4=24, prefixe_v6=64):
+    """
+    Ramène une adresse (version, entier) à son réseau (version, entier, longueur)
+    Les noms d'hôte (chaînes) sont renvoyés sans modification
+    """
+    if isinstance(adresse, str):
+        return adresse
+    version, valeur = adresse
+    longueur = prefixe_v4 if version == 4 else prefixe_v6
+    return (version, valeur & masque(version, longueur), longueur)
+
+
+def adresse_vers_texte(cle):
+    """
+    Convertit une clé (version, entier) ou (version, entier, longueur) en texte lisible
+    Exemple: (4, 3232235776, 24) -> '192.168.1.0/24'
+    """
+    if isinstance(cle, str):
+        return cle
+    version, valeur = cle[0], cle[1]
+    if version == 4:
+        texte = f"{valeur >> 24}.{(valeur >> 16) & 255}.{(valeur >> 8) & 255}.{valeur & 255}"
+    else:
+        texte = str(ipaddress.IPv6Address(valeur))
+    # Un préfixe complet (/32 ou /128) désigne un hôte : on n'affiche pas la longueur
+    if len(cle) == 3 and cle[2] < (32 if version == 4 else 128):
+        texte += f"/{cle[2]}"
+    return texte
+
+
+def agreger(compteur, prefixe_v4=24, prefixe_v6=64):
+    """
+    Regroupe un Counter indexé par adresses (version, entier) par sous-réseau
+    Les adresses ont déjà été analysées : seul un ET binaire est appliqué
+    Les clés tuple (ex: (source, cible, verdict)) sont agrégées sur leur premier élément
+    """
+    resultat = Counter()
+    for cle, nombre in compteur.items():
+        if isinstance(cle, tuple) and not isinstance(cle[0], int):
+            cle = (reseau(cle[0], prefixe_v4, prefixe_v6),) + cle[1:]
+        else:
+            cle = reseau(cle, prefixe_v4, prefixe_v6)
+        resultat[cle] += nombre
+    return resultat
+
+
+def top_texte(compteur, n=10):
+    """Retourne le top n d'un Counter avec les clés d'adresses converties en texte"""
+    resultat = []
+    for cle, nombre in compteur.most_common(n):
+        if isinstance(cle, tuple) and not isinstance(cle[0], int):
+            cle = tuple(adresse_vers_texte(c) if isinstance(c, tuple) else c for c in cle)
+        else:
+            cle = adresse_vers_texte(cle)
+        resultat.append((cle, nombre))
+    return resultat
+
+
+class ArbrePrefixes:
+    """
+    Arbre binaire de préfixes (trie) pour étiqueter les adresses par sous-réseau
+    Recherche du préfixe le plus long en O(longueur du préfixe), avec cache par adresse
+    Exemple: 10.0.0.0/8 -> 'interne', 10.1.2.0/24 -> 'dmz' : 10.1.2.7 est étiquetée 'dmz'
+    """
+
+    def __init__(self):
+        # Une racine par version IP ; chaque nœud est [fils_0, fils_1, étiquette]
+        self.racines = {4: [None, None, None], 6: [None, None, None]}
+        self.profondeur_max = {4: 0, 6: 0}
+        self.nombre = 0
+        self.cache = {}
+
+    def ajouter(self, cidr, etiquette):
+        """Ajoute un réseau au format CIDR (ex: '192.168.0.0/16') avec son étiquette"""
+        reseau_ip = ipaddress.ip_network(cidr.strip(), strict=False)
+        version = reseau_ip.version
+        bits = reseau_ip.max_prefixlen
+        valeur = int(reseau_ip.network_address)
+        noeud = self.racines[version]
+        for i in range(reseau_ip.prefixlen):
+            bit = (valeur >> (bits - 1 - i)) & 1
+            if noeud[bit] is None:
+                noeud[bit] = [None, None, None]
+            noeud = noeud[bit]
+        if noeud[2] is None:
+            self.nombre += 1
+        noeud[2] = etiquette
+        self.profondeur_max[version] = max(self.profondeur_max[version], reseau_ip.prefixlen)
+        self.cache.clear()
+
+    def chercher(self, adresse):
+        """
+        Retourne l'étiquette du préfixe le plus long contenant l'adresse (version, entier)
+        Retourne None si aucun réseau ne correspond ou si l'adresse est un nom d'hôte
+        """
+        if adresse in self.cache:
+            return self.cache[adresse]
+        etiquette = None
+        if not isinstance(adresse, str):
+            version, valeur = adresse
+            bits = 32 if version == 4 else 128
+            noeud = self.racines[version]
+            etiquette = noeud[2]
+            # On ne descend pas plus bas que le préfixe le plus long chargé
+            for i in range(self.profondeur_max[version]):
+                noeud = noeud[(valeur >> (bits - 1 - i)) & 1]
+                if noeud is None:
+                    break
+                if noeud[2] is not None:
+                    etiquette = noeud[2]
+        self.cache[adresse] = etiquette
+        return etiquette
+
+    def __len__(self):
+        return self.nombre
+
+
+def charger_prefixes(nom_fichier):
+    """
+    Charge un fichier de réseaux (une ligne par réseau : 'CIDR;étiquette' ou 'CIDR étiquette')
+    Les lignes vides et les commentaires (#) sont ignorés
+    Retourne un ArbrePrefixes, ou None si le fichier n'existe pas
+    """
+    arbre = ArbrePrefixes()
+    try:
+        with open(nom_fichier, 'r', encoding='utf-8') as f:
+            for numero, ligne in enumerate(f, 1):
+                ligne = ligne.split('#', 1)[0].strip()
+                if not ligne:
+                    continue
+                parties = ligne.replace(';', ' ').split(None, 1)
+                if len(parties) < 2:
+                    print(f"Ligne {numero} ignorée (étiquette manquante) : {ligne}")
+                    continue
+                try:
+                    arbre.ajouter(parties[0], parties[1].strip().lower())
+                except ValueError:
+                    print(f"Ligne {numero} ignorée (réseau invalide) : {ligne}")
+    except FileNotFoundError:
+        return None
+    return arbre
+
+
+# Étiquettes ayant un effet sur le verdict (en minuscules, comme chargées par charger_prefixes)
+ZONES_AUTORISEES = {'autorise', 'autorisé', 'allowlist', 'allow-list'}
+ZONES_SURVEILLEES = {'scanner', 'surveille', 'surveillé', 'blocklist'}
+
+
+def ajuster_verdict(verdict, zone_src, verdicts_normaux=("Normal",)):
+    """
+    Adapte le verdict selon l'étiquette du réseau source
+    - source autorisée (ex: scanner de vulnérabilités interne) : l'alerte est supprimée
+    - source surveillée (scanner connu) : tout son trafic devient une alerte
+    """
+    if zone_src in ZONES_AUTORISEES and verdict not in verdicts_normaux:
+        return verdicts_normaux[0]
+    if zone_src in ZONES_SURVEILLEES:
+        if verdict in verdicts_normaux:
+            return f"Source surveillée ({zone_src})"
+        return f"{verdict} - Source surveillée ({zone_src})"
+    return verdict
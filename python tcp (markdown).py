@@ -10,14 +10,20 @@ import matplotlib.pyplot as plt # Pour créer les graphiques (visuels)
 import re       # "Regular Expressions" : Pour découper le texte complexe des logs
 import csv      # Pour créer le fichier Excel à la fin
 import os       # Pour manipuler les chemins de fichiers (Windows/Linux)
+import time     # Pour convertir les horodatages (epoch <-> date lisible)
 import markdown # Convertit le texte formaté (*gras*, # titres) en code HTML
 import base64   # Convertit une image en une longue chaîne de texte (pour l'incruster dans le HTML)
 import io       # Permet de gérer des fichiers virtuels dans la mémoire RAM (très rapide)
 import tkinter as tk            # Bibliothèque d'interface graphique
 from tkinter import filedialog  # Module spécifique pour la boîte de dialogue "Ouvrir"
 from collections import Counter # Outil statistique pour compter (ex: combien de fois l'IP X apparaît)
+from outils_reseau import REGEX_INFO, LecteurHorodatage, separer_adresse_port, nom_service, ip_vers_entier, agreger, top_texte # Adresses IP en entiers + regroupement par sous-réseau
+from outils_reseau import charger_prefixes, ajuster_verdict # Étiquetage des adresses par réseau connu (interne, dmz, scanner...)
 
-def analyser_trafic():
+def analyser_trafic(prefixe_v4=24, prefixe_v6=64, fichier_reseaux=None):
+    # prefixe_v4 / prefixe_v6 : longueur du préfixe utilisée pour regrouper les sources par sous-réseau
+    # (ex: 24 -> 192.168.1.0/24, 16 -> 192.168.0.0/16, 32 -> une seule machine)
+    # fichier_reseaux : fichier des réseaux connus (une ligne "CIDR;étiquette"), par défaut reseaux.txt
 
 
     # ÉTAPE 1 : INTERFACE DE SÉLECTION DE FICHIER
@@ -49,19 +55,35 @@ def analyser_trafic():
     
     paquets = []
     # Initialisation des compteurs pour les statistiques
-    stats = {'flags': Counter(), 'src': Counter(), 'srv': Counter(), 'menaces': Counter()}
+    stats = {'flags': Counter(), 'src': Counter(), 'srv': Counter(), 'menaces': Counter(), 'zones': Counter()}
+
+    # RÉSEAUX CONNUS (étiquetage des adresses)
+    # Le fichier contient des lignes "10.0.0.0/8;interne", "192.168.50.0/24;dmz", "203.0.113.7/32;scanner"...
+    # Il est chargé dans un arbre de préfixes : chaque recherche ne parcourt que les bits du préfixe
+    # (au plus 32 en IPv4) au lieu de tester tous les réseaux un par un.
+    zones = charger_prefixes(fichier_reseaux or os.path.join(os.path.dirname(fichier), "reseaux.txt"))
+    if zones: print(f"{len(zones)} réseaux connus chargés.")
 
     # EXPLICATION DE LA REGEX (Le filtre de lecture)
     # r"..." signifie "raw string" (pour éviter les conflits avec les caractères spéciaux)
-    # (\S+)       : Groupe 1 -> Capture le Timestamp (l'heure) au début de la ligne.
-    # IP          : Cherche le mot exact "IP".
-    # ([\w\.-]+)  : Groupe 2 -> Capture l'IP Source (lettres, chiffres, points).
+    # (?:(date) )? : Groupe 1 -> Date optionnelle (format tcpdump -tttt : 2025-12-10), sinon None.
+    # (\S+)       : Groupe 2 -> Capture le Timestamp (l'heure) au début de la ligne.
+    # IP6?        : Cherche le mot exact "IP" (IPv4) ou "IP6" (IPv6) : une seule regex pour les deux.
+    # ([\w\.:%-]+): Groupe 3 -> Capture l'IP Source (lettres, chiffres, points, ':' des adresses IPv6).
     # >           : Le séparateur visuel.
-    # ([\w\.-]+)  : Groupe 3 -> Capture l'IP Destination.
-    # : (.*)      : Groupe 4 -> Capture TOUT LE RESTE de la ligne après les deux points.
+    # ([\w\.:%-]+): Groupe 4 -> Capture l'IP Destination.
+    # : (.*)      : Groupe 5 -> Capture TOUT LE RESTE de la ligne après les deux points.
     #               C'est crucial car cela capture aussi bien les "Flags [S]" du TCP 
     #               que les requêtes "A? google.com" du DNS.
-    regex = re.compile(r"(\S+) IP ([\w\.-]+) > ([\w\.-]+): (.*)")
+    # La regex est définie dans outils_reseau.py (REGEX_INFO), partagée avec le benchmark.
+    regex = REGEX_INFO
+
+    # Conversion des horodatages en epoch (secondes depuis 1970, nombre à virgule).
+    # Cela permet de calculer des durées, des débits, et de trier plusieurs fichiers ensemble.
+    # Sans l'option -tttt, tcpdump n'écrit que l'heure : la date de modification du fichier est la fin
+    # de la capture (le premier paquet peut donc dater de la veille), et on détecte le passage à minuit
+    # (l'heure repart de 00:00).
+    lire_horodatage = LecteurHorodatage(fin_capture=os.path.getmtime(fichier))
 
     try:
         with open(fichier, 'r', encoding='utf-8', errors='ignore') as f:
@@ -71,7 +93,8 @@ def analyser_trafic():
                 if not match: continue # Si la ligne est bizarre/vide, on passe à la suivante
                 
                 # Extraction des données brutes
-                heure, src_raw, dst_raw, info_brute = match.groups()
+                date, heure, src_raw, dst_raw, info_brute = match.groups()
+                epoch = lire_horodatage(date, heure)
                 
                 # --- A. Extraction Spécifique des Flags TCP ---
                 # On cherche si le motif "Flags [quelquechose]" existe dans la fin de la ligne.
@@ -85,11 +108,12 @@ def analyser_trafic():
                 # --- B. Nettoyage des IPs et Ports ---
                 # Les logs mélangent souvent IP et Port (ex: 192.168.1.5.80 ou 10.0.0.1.domain)
                 def split_srv(x): 
-                    # On coupe au dernier point
-                    p = x.rsplit('.', 1)
-                    # Si la partie après le point n'est pas un chiffre (ex: 'ssh', 'domain'), on la garde comme Service.
-                    # Sinon, on considère que c'est une partie de l'IP ou un port numérique.
-                    return (p[0], p[1]) if len(p) > 1 and not p[1].isdigit() else (x, "")
+                    # On coupe au dernier point (sauf pour une IPv4 sans port, ex: ICMP)
+                    ip, port = separer_adresse_port(x)
+                    # Si la partie après le point est un nom (ex: 'ssh', 'domain'), on la garde comme Service.
+                    # Si c'est un port numérique (capture en -n / -nn), on cherche son nom dans la table
+                    # des ports connus (ex: 22 -> 'ssh', 53 -> 'domain') : simple lecture de liste, sans DNS.
+                    return (ip, nom_service(port))
                 
                 src_ip, src_srv = split_srv(src_raw)
                 dst_ip, dst_srv = split_srv(dst_raw)
@@ -137,28 +161,43 @@ def analyser_trafic():
                     elif verdict == "Normal":
                         verdict = "Requête DNS"
 
+                # Conversion des adresses en entiers (4, 3232235788) une seule fois.
+                # Le cache de ip_vers_entier évite de refaire le travail pour une IP déjà vue.
+                src_cle = ip_vers_entier(src_ip)
+                dst_cle = ip_vers_entier(dst_ip)
+                
+                # --- Règle 3 : Réseaux connus ---
+                # Une source autorisée (ex: scanner interne) n'est pas une menace,
+                # une source surveillée (scanner connu) est toujours signalée.
+                src_zone = (zones.chercher(src_cle) or "") if zones else ""
+                dst_zone = (zones.chercher(dst_cle) or "") if zones else ""
+                verdict = ajuster_verdict(verdict, src_zone, ("Normal", "Requête DNS"))
+
                 # --- Stockage ---
                 # Pour l'affichage, si on n'a pas de flags TCP, on affiche un bout de l'info brute (ex: la requête DNS)
                 affichage_info = flags if flags else (info_brute[:30] + "..." if len(info_brute)>30 else info_brute)
                 
-                paquets.append([heure, src_ip, dst_ip, service, affichage_info, verdict])
+                paquets.append([heure, src_ip, dst_ip, service, affichage_info, verdict, src_zone, dst_zone, epoch])
                 
                 # Mise à jour des statistiques
                 stats['flags'][flags if flags else "UDP/Autre"] += 1
-                stats['src'][src_ip] += 1
+                if zones: stats['zones'][(src_zone or "Inconnu", dst_zone or "Inconnu", verdict)] += 1
+                stats['src'][src_cle] += 1
                 if service: stats['srv'][service] += 1
                 
                 # Si une menace est détectée (on exclut le trafic normal et les simples requêtes DNS)
                 if verdict not in ["Normal", "Requête DNS"]: 
-                    # On masque le dernier chiffre de l'IP (ex: 192.168.1.12 -> 192.168.1.*)
-                    # Cela permet de regrouper les attaques venant d'un même sous-réseau.
-                    src_net = src_ip.rsplit('.', 1)[0] + ".*" if re.match(r"^\d", src_ip) else src_ip
-                    stats['menaces'][(src_net, dst_ip, verdict)] += 1
+                    stats['menaces'][(src_cle, dst_cle, verdict)] += 1
 
     except Exception as e:
         print(f"Erreur lors de la lecture du fichier : {e}")
         return
 
+    # Regroupement par sous-réseau : un simple ET binaire avec le masque (ex: /24 -> 192.168.1.0/24)
+    # Les adresses sont déjà des entiers, donc aucune ré-analyse du texte n'est nécessaire.
+    stats['menaces'] = agreger(stats['menaces'], prefixe_v4, prefixe_v6)
+    stats['reseaux'] = agreger(stats['src'], prefixe_v4, prefixe_v6)
+
     # ÉTAPE 4 : GÉNÉRATION DES VISUELS (Encoding Base64)
     
     # Cette fonction transforme un graphique Matplotlib en texte (Base64)
@@ -169,7 +208,7 @@ def analyser_trafic():
         plt.style.use('ggplot') # Style "R" ou "Excel" moderne
         
         # On ne garde que le Top 10 pour la lisibilité
-        top_items = data.most_common(10)
+        top_items = top_texte(data) # Les adresses (entiers) sont reconverties en texte
         labels = [str(k) for k, v in top_items]
         values = [v for k, v in top_items]
 
@@ -193,17 +232,29 @@ def analyser_trafic():
     img_flags = plot_to_b64(stats['flags'], "Répartition Protocoles/Flags", 'pie')
     img_srv = plot_to_b64(stats['srv'], "Top Services")
     img_src = plot_to_b64(stats['src'], "Top Sources IP")
+    img_net = plot_to_b64(stats['reseaux'], f"Top Sous-réseaux (/{prefixe_v4})")
 
 
     # ÉTAPE 5 : CRÉATION DU RAPPORT HTML
 
     
+    # Période couverte par la capture (premier et dernier paquet) et débit moyen
+    epochs = [p[8] for p in paquets if p[8] is not None]
+    if epochs:
+        debut, fin = min(epochs), max(epochs)
+        duree = fin - debut
+        debit = len(epochs) / duree if duree > 0 else len(epochs)
+        periode = (f"{time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(debut))} → "
+                   f"{time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(fin))} ({duree:.1f} s, {debit:.1f} paquets/s)")
+    else:
+        periode = "Inconnue"
+
     # Fonction pour créer un tableau au format Markdown
     def md_table(headers, data_counter):
         # Création de l'entête | Col1 | Col2 |
         tbl = "| " + " | ".join(headers) + " |\n| " + " | ".join(["---"] * len(headers)) + " |\n"
         # Remplissage des lignes
-        for key, count in data_counter.most_common(15):
+        for key, count in top_texte(data_counter, 15):
             cols = list(key) if isinstance(key, tuple) else [key]
             cols = [str(c) for c in cols] + [str(count)]
             tbl += "| " + " | ".join(cols) + " |\n"
@@ -214,6 +265,8 @@ def analyser_trafic():
 # Rapport de Sécurité Réseau
 *Fichier analysé : {os.path.basename(fichier)}*
 
+*Période : {periode}*
+
 ## 📊 Synthèse Visuelle
 | Distribution du Trafic | Top Services |
 | :---: | :---: |
@@ -222,15 +275,22 @@ def analyser_trafic():
 ### Sources les plus actives
 ![][img3]
 
+### Sous-réseaux les plus actifs (/{prefixe_v4} - IPv6 /{prefixe_v6})
+![][img4]
+
 ## 🚨 ALERTES DE SÉCURITÉ (DNS & TCP)
 {md_table(['Source', 'Cible', 'Type d\'Alerte', 'Volume'], stats['menaces'])}
 
+## 🗺️ Flux entre zones (réseaux connus)
+{md_table(['Zone Source', 'Zone Cible', 'Verdict', 'Volume'], stats['zones']) if zones else "*Aucun fichier de réseaux connus.*"}
+
 ## ℹ️ Détails Techniques (Flags/Info)
 {md_table(['Type', 'Volume'], stats['flags'])}
 
 [img1]: data:image/png;base64,{img_flags}
 [img2]: data:image/png;base64,{img_srv}
 [img3]: data:image/png;base64,{img_src}
+[img4]: data:image/png;base64,{img_net}
     """
 
     # Template HTML final avec CSS (Mise en page)
@@ -255,7 +315,7 @@ def analyser_trafic():
     try:
         with open(f"{nom_base}_donnees.csv", 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f, delimiter=';')
-            writer.writerow(["Heure", "Source", "Dest", "Service", "Info/Flags", "Verdict"])
+            writer.writerow(["Heure", "Source", "Dest", "Service", "Info/Flags", "Verdict", "Zone Source", "Zone Dest", "Epoch"])
             writer.writerows(paquets)
         print("-> Fichier CSV généré.")
     except Exception as e: print(f"Erreur lors de la création du CSV: {e}")
@@ -1,50 +1,65 @@
-import re, csv, os, json, tkinter as tk
+import csv, os, json, time, tkinter as tk
 from tkinter import filedialog
 from collections import Counter
+from outils_reseau import REGEX_FLAGS, LecteurHorodatage, separer_adresse_port, nom_service, ip_vers_entier, agreger, top_texte, charger_prefixes, ajuster_verdict
 
-def analyser_trafic():
+def analyser_trafic(prefixe_v4=24, prefixe_v6=64, fichier_reseaux=None):
     # --- 1. SÉLECTION FICHIER ---
     root = tk.Tk(); root.withdraw()
     fichier = filedialog.askopenfilename(title="Fichier tcpdump")
     if not fichier: return
     print(f"Analyse de {os.path.basename(fichier)}...")
 
-    paquets, stats = [], {'flags': Counter(), 'src': Counter(), 'srv': Counter(), 'menaces': Counter()}
-    # Regex standard tcpdump (timestamp IP src > dst: Flags [flags])
-    regex = re.compile(r"(\S+) IP ([\w\.-]+) > ([\w\.-]+): Flags \[(.*?)\]")
+    paquets, stats = [], {'flags': Counter(), 'src': Counter(), 'srv': Counter(), 'menaces': Counter(), 'zones': Counter()}
+    # Réseaux connus (CIDR;étiquette), par défaut reseaux.txt à côté de la capture
+    zones = charger_prefixes(fichier_reseaux or os.path.join(os.path.dirname(fichier), "reseaux.txt"))
+    if zones: print(f"{len(zones)} réseaux connus chargés.")
+    # Regex standard tcpdump ([date] timestamp IP/IP6 src > dst: Flags [flags])
+    regex = REGEX_FLAGS
+    # Horodatages en epoch ; sans -tttt, la date est déduite de la dernière modification du fichier (fin de la capture)
+    lire_horodatage = LecteurHorodatage(fin_capture=os.path.getmtime(fichier))
 
     with open(fichier, 'r', encoding='utf-8', errors='ignore') as f:
         for line in f:
             match = regex.search(line)
             if not match: continue
             
-            heure, src_raw, dst_raw, flags = match.groups()
+            date, heure, src_raw, dst_raw, flags = match.groups()
             flags = flags.strip()
+            epoch = lire_horodatage(date, heure)
 
-            # Extraction port service (seulement si lettres)
+            # Extraction port service (port numérique résolu par la table des ports connus)
             def split_srv(x): 
-                p = x.rsplit('.', 1)
-                return (p[0], p[1]) if len(p) > 1 and not p[1].isdigit() else (x, "")
+                ip, port = separer_adresse_port(x)
+                return (ip, nom_service(port))
             
             src_ip, src_srv = split_srv(src_raw)
             dst_ip, dst_srv = split_srv(dst_raw)
             service = dst_srv or src_srv # On garde le nom du service s'il existe
 
+            # Adresses converties une seule fois en entiers (avec cache), puis étiquetées par réseau
+            src_cle, dst_cle = ip_vers_entier(src_ip), ip_vers_entier(dst_ip)
+            src_zone = (zones.chercher(src_cle) or "") if zones else ""
+            dst_zone = (zones.chercher(dst_cle) or "") if zones else ""
+
             # Détection Menaces
             verdict = "Normal"
             if 'S' in flags and '.' not in flags: verdict = "SYN Flood (DOS)"
             elif 'R' in flags: verdict = "Rejet (RST)"
             elif service in ['ssh', 'telnet', 'rdp']: verdict = f"Admin Distant ({service})"
+            verdict = ajuster_verdict(verdict, src_zone)
 
             # Stockage & Stats
-            paquets.append([heure, src_ip, dst_ip, service, flags, verdict])
+            paquets.append([heure, src_ip, dst_ip, service, flags, verdict, src_zone, dst_zone, epoch])
             stats['flags'][flags] += 1
-            stats['src'][src_ip] += 1
+            if zones: stats['zones'][(src_zone or "Inconnu", dst_zone or "Inconnu", verdict)] += 1
+            stats['src'][src_cle] += 1
             if service: stats['srv'][service] += 1
-            if verdict != "Normal": 
-                # Regroupement des menaces par sous-réseau source
-                src_net = src_ip.rsplit('.', 1)[0] + ".*" if re.match(r"^\d", src_ip) else src_ip
-                stats['menaces'][(src_net, dst_ip, verdict)] += 1
+            if verdict != "Normal": stats['menaces'][(src_cle, dst_cle, verdict)] += 1
+
+    # Regroupement par sous-réseau (masque binaire, sans re-analyser les adresses)
+    stats['menaces'] = agreger(stats['menaces'], prefixe_v4, prefixe_v6)
+    stats['reseaux'] = agreger(stats['src'], prefixe_v4, prefixe_v6)
 
     # --- 2. EXPORTS ---
     nom_base = os.path.splitext(fichier)[0]
@@ -53,15 +68,22 @@ def analyser_trafic():
     try:
         with open(f"{nom_base}_analyse.csv", 'w', newline='') as f:
             writer = csv.writer(f, delimiter=';')
-            writer.writerow(["Heure", "Source", "Dest", "Service", "Flags", "Verdict"])
+            writer.writerow(["Heure", "Source", "Dest", "Service", "Flags", "Verdict", "Zone Source", "Zone Dest", "Epoch"])
             writer.writerows(paquets)
         print("-> CSV généré.")
     except Exception as e: print(f"Err CSV: {e}")
 
+    # Période de capture (à partir des horodatages epoch)
+    epochs = [p[8] for p in paquets if p[8] is not None]
+    debut, fin = (min(epochs), max(epochs)) if epochs else (0, 0)
+    duree = fin - debut
+    periode = (f"{time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(debut))} → {time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(fin))}"
+               f" ({duree:.1f} s, {len(epochs) / duree if duree > 0 else len(epochs):.1f} paquets/s)") if epochs else "Inconnue"
+
     # HTML Generator Helpers
     def table_rows(data, is_dict=False):
         rows = ""
-        items = data.most_common(10) if is_dict else data
+        items = top_texte(data) if is_dict else data
         for k, v in items:
             if is_dict: # Traitement pour stats
                 val_col = f"<td>{k}</td><td class='c'>{v}</td>"
@@ -72,25 +94,28 @@ def analyser_trafic():
             rows += f"<tr>{val_col}</tr>"
         return rows if rows else "<tr><td colspan='4'>Aucune donnée</td></tr>"
 
-    js_data = {k: {'l': [x[0] for x in v.most_common(10)], 'd': [x[1] for x in v.most_common(10)]} 
-               for k, v in stats.items() if k != 'menaces'}
+    js_data = {k: {'l': [x[0] for x in top_texte(v)], 'd': [x[1] for x in top_texte(v)]} 
+               for k, v in stats.items() if k not in ('menaces', 'zones')}
 
     html = f"""<!DOCTYPE html><html lang='fr'><head><meta charset='UTF-8'><title>Rapport</title>
     <script src='https://cdn.jsdelivr.net/npm/chart.js'></script>
     <style>body{{font-family:sans-serif;background:#f0f2f5;padding:20px}} .grid{{display:grid;grid-template-columns:1fr 1fr;gap:20px}} 
     .card{{background:#fff;padding:15px;border-radius:8px;box-shadow:0 2px 5px rgba(0,0,0,0.1)}} table{{width:100%;border-collapse:collapse}} 
     td,th{{padding:8px;border-bottom:1px solid #ddd}} th{{background:#007bff;color:#fff}} .c{{text-align:center}} .full{{grid-column:span 2}}</style></head>
-    <body><h1>Rapport: {os.path.basename(fichier)}</h1><div class='grid'>
+    <body><h1>Rapport: {os.path.basename(fichier)}</h1><p>Période : {periode}</p><div class='grid'>
         <div class='card'><h3>Top Flags</h3><canvas id='c1'></canvas></div>
         <div class='card'><h3>Top Services (Nommés)</h3><canvas id='c2'></canvas></div>
         <div class='card full'><h3>🚨 Menaces Détectées</h3><table><tr><th>Source</th><th>Cible</th><th>Type</th><th>Qté</th></tr>{table_rows(stats['menaces'], True)}</table></div>
+        <div class='card full'><h3>Flux entre zones</h3><table><tr><th>Zone Source</th><th>Zone Cible</th><th>Verdict</th><th>Qté</th></tr>{table_rows(stats['zones'], True)}</table></div>
         <div class='card'><h3>Détail Flags</h3><table><tr><th>Flag</th><th>Desc</th><th>Qté</th></tr>{table_rows(stats['flags'].items())}</table></div>
         <div class='card'><h3>Top Sources</h3><canvas id='c3'></canvas></div>
+        <div class='card'><h3>Top Sous-réseaux (/{prefixe_v4} - IPv6 /{prefixe_v6})</h3><canvas id='c4'></canvas></div>
     </div><script>
     const d = {json.dumps(js_data)};
     new Chart(document.getElementById('c1'), {{type:'pie', data:{{labels:d.flags.l, datasets:[{{data:d.flags.d, backgroundColor:['#36a2eb','#ff6384','#ffcd56','#4bc0c0']}}]}}}});
     new Chart(document.getElementById('c2'), {{type:'bar', indexAxis:'y', data:{{labels:d.srv.l, datasets:[{{label:'Paquets', data:d.srv.d, backgroundColor:'#9966ff'}}]}}}});
     new Chart(document.getElementById('c3'), {{type:'bar', data:{{labels:d.src.l, datasets:[{{label:'Source', data:d.src.d, backgroundColor:'#343a40'}}]}}}});
+    new Chart(document.getElementById('c4'), {{type:'bar', data:{{labels:d.reseaux.l, datasets:[{{label:'Sous-réseau', data:d.reseaux.d, backgroundColor:'#6c757d'}}]}}}});
     </script></body></html>"""
 
     with open(f"{nom_base}_rapport.html", 'w', encoding='utf-8') as f: f.write(html)
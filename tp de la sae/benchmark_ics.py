@@ -0,0 +1,131 @@
+"""
+benchmark_ics.py
+Mesure le temps de lecture des événements d'un fichier .ics agrandi (par défaut 100 000 événements)
+Compare l'ancienne méthode (extraire_evenements + un extraire_propriete par propriété)
+avec le découpage en une seule passe (lire_evenements_ics)
+Mesure aussi Calendrier.depuis_fichier : relecture complète du fichier contre chargement depuis le cache
+Mesure de référence (100 000 événements) : environ 1,4 s -> 0,9 s, soit x1,5 à x1,6
+(le découpage en une passe recolle aussi les lignes repliées et sépare les paramètres)
+Usage : python benchmark_ics.py [nombre_d_evenements]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import calendrier
+from calendrier import Calendrier, lire_evenements_ics
+
+PROPRIETES = ['UID', 'DTSTART', 'DTEND', 'SUMMARY', 'LOCATION', 'DESCRIPTION']
+
+
+def ancien_extraire_evenements(contenu):
+    """Ancienne version : liste de chaînes, une par événement (gardée comme référence)"""
+    evenements = []
+    evenement_actuel = []
+    dans_evenement = False
+    for ligne in contenu.split('\n'):
+        ligne = ligne.strip()
+        if ligne == "BEGIN:VEVENT":
+            dans_evenement = True
+            evenement_actuel = [ligne]
+        elif ligne == "END:VEVENT":
+            evenement_actuel.append(ligne)
+            evenements.append('\n'.join(evenement_actuel))
+            evenement_actuel = []
+            dans_evenement = False
+        elif dans_evenement:
+            evenement_actuel.append(ligne)
+    return evenements
+
+
+def ancien_extraire_propriete(contenu, identificateur):
+    """Ancienne version : redécoupe l'événement à chaque propriété (gardée comme référence)"""
+    for ligne in contenu.split('\n'):
+        if ligne.startswith(identificateur + ':'):
+            return ligne.split(':', 1)[1].strip()
+    return "vide"
+
+
+def agrandir_calendrier(contenu, nombre):
+    """Répète les événements du fichier jusqu'à obtenir le nombre d'événements voulu"""
+    debut = contenu.index("BEGIN:VEVENT")
+    fin = contenu.rindex("END:VEVENT") + len("END:VEVENT")
+    blocs = contenu[debut:fin].split("END:VEVENT")
+    blocs = [bloc + "END:VEVENT" for bloc in blocs if "BEGIN:VEVENT" in bloc]
+    repetes = (blocs * (nombre // len(blocs) + 1))[:nombre]
+    return contenu[:debut] + "\n".join(b.strip() for b in repetes) + "\nEND:VCALENDAR\n"
+
+
+def methode_ancienne(contenu):
+    resultat = []
+    for evenement in ancien_extraire_evenements(contenu):
+        resultat.append([ancien_extraire_propriete(evenement, p) for p in PROPRIETES])
+    return resultat
+
+
+def methode_une_passe(contenu):
+    resultat = []
+    for evenement in lire_evenements_ics(contenu.split('\n')):
+        resultat.append([evenement.get(p, "vide") for p in PROPRIETES])
+    return resultat
+
+
+def vider_caches():
+    """Vide les caches lru_cache du module calendrier (dates, groupes...) : chaque mesure part de zéro"""
+    for objet in vars(calendrier).values():
+        if hasattr(objet, 'cache_clear'):
+            objet.cache_clear()
+
+
+def mesurer_cache(contenu):
+    """
+    Compare Calendrier.depuis_fichier sans cache (relecture complète) et avec un cache déjà écrit
+    Retourne {mesure: durée en secondes}
+    """
+    durees = {}
+    with tempfile.TemporaryDirectory() as dossier:
+        nom_fichier = os.path.join(dossier, "agrandi.ics")
+        with open(nom_fichier, 'w', encoding='utf-8') as f:
+            f.write(contenu)
+        for nom, utiliser_cache in [("Relecture complète (sans cache)", False),
+                                    ("Relecture + écriture du cache", True),
+                                    ("Chargement depuis le cache", True)]:
+            vider_caches()
+            debut = time.perf_counter()
+            lu = Calendrier.depuis_fichier(nom_fichier, utiliser_cache=utiliser_cache)
+            durees[nom] = time.perf_counter() - debut
+            assert lu is not None and len(lu) > 0
+    return durees
+
+
+if __name__ == "__main__":
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with open("ADE_RT1_Septembre2025_Decembre2025.ics", 'r', encoding='utf-8') as fichier:
+        contenu = agrandir_calendrier(fichier.read(), nombre)
+
+    print(f"=== Benchmark lecture .ics ({nombre} événements) ===\n")
+    durees = {}
+    resultats = {}
+    for nom, methode in [("Ancienne (6 recherches/événement)", methode_ancienne),
+                         ("Une seule passe", methode_une_passe)]:
+        debut = time.perf_counter()
+        resultats[nom] = methode(contenu)
+        durees[nom] = time.perf_counter() - debut
+        print(f"{nom:<36} {durees[nom]:8.3f} s")
+
+    ancienne, nouvelle = durees.values()
+    print(f"\nAccélération : x{ancienne / nouvelle:.1f}")
+    ancien, nouveau = resultats.values()
+    differents = sum(1 for a, b in zip(ancien, nouveau) if a != b)
+    print(f"Événements lus : {len(ancien)} / {len(nouveau)}")
+    # L'ancienne méthode tronque les propriétés repliées sur plusieurs lignes (ex: longues DESCRIPTION)
+    print(f"Événements différents (lignes repliées recollées) : {differents}")
+
+    print(f"\n=== Calendrier.depuis_fichier ({nombre} événements) ===\n")
+    durees_cache = mesurer_cache(contenu)
+    for nom, duree in durees_cache.items():
+        print(f"{nom:<36} {duree:8.3f} s")
+    relecture, _, cache = durees_cache.values()
+    print(f"\nCache : x{relecture / cache:.1f} par rapport à la relecture complète")
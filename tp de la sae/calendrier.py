@@ -0,0 +1,809 @@
+"""
+calendrier.py
+Module commun aux programmes de la SAÉ (python 1.py à python 4.py)
+Lecture d'un fichier .ics en une seule passe et fonctions d'extraction partagées
+Un objet Calendrier est lu une fois puis réutilisé par toutes les requêtes d'un même programme
+"""
+
+import hashlib
+import marshal
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+# Version du format du cache : à incrémenter si la structure des événements change
+VERSION_CACHE = 5
+
+
+def lire_lignes_ics(nom_fichier):
+    """
+    Ouvre un fichier .ics et retourne un générateur de ses lignes (lecture au fil de l'eau)
+    Le fichier n'est jamais chargé entièrement en mémoire ; retourne None s'il est illisible
+    """
+    try:
+        fichier = open(nom_fichier, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        print(f"Erreur : Le fichier {nom_fichier} n'a pas été trouvé.")
+        return None
+    except Exception as e:
+        print(f"Erreur lors de la lecture du fichier : {e}")
+        return None
+
+    def lignes():
+        with fichier:
+            yield from fichier
+
+    return lignes()
+
+
+class Evenement(dict):
+    """
+    Propriétés d'un événement {nom: valeur}
+    Les paramètres éventuels sont rangés à part : parametres['DTSTART'] -> {'TZID': 'Europe/Paris'}
+    """
+    __slots__ = ('parametres',)
+
+
+def deplier_lignes(lignes):
+    """
+    Recolle les lignes repliées (RFC 5545 : une ligne qui commence par un espace ou une tabulation
+    est la suite de la ligne précédente) et renvoie (générateur) les lignes logiques
+    """
+    ligne_courante = None
+
+    for ligne in lignes:
+        ligne = ligne.rstrip('\r\n')
+
+        if ligne and ligne[0] in ' \t' and ligne_courante is not None:
+            ligne_courante += ligne[1:]
+            continue
+
+        if ligne_courante is not None:
+            yield ligne_courante
+        ligne_courante = ligne
+
+    if ligne_courante is not None:
+        yield ligne_courante
+
+
+def decouper_propriete(ligne):
+    """
+    Découpe une ligne logique en (nom, paramètres, valeur)
+    Exemples: 'SUMMARY:R1.07' -> ('SUMMARY', {}, 'R1.07')
+              'DTSTART;TZID=Europe/Paris:20251205T100000' -> ('DTSTART', {'TZID': 'Europe/Paris'}, '20251205T100000')
+    Retourne None si la ligne ne contient pas de ':'
+    """
+    tete, separateur, valeur = ligne.partition(':')
+    if not separateur:
+        return None
+
+    # Cas le plus courant : pas de paramètres
+    if ';' not in tete:
+        return (tete.strip(), {}, valeur)
+
+    # Avec paramètres : un ':' entre guillemets (ex: ALTREP="http://...") ne termine pas le nom
+    if '"' in tete:
+        entre_guillemets = False
+        for position, caractere in enumerate(ligne):
+            if caractere == '"':
+                entre_guillemets = not entre_guillemets
+            elif caractere == ':' and not entre_guillemets:
+                tete, valeur = ligne[:position], ligne[position + 1:]
+                break
+        else:
+            return None
+
+    nom, *morceaux = tete.split(';')
+    parametres = {}
+    for morceau in morceaux:
+        cle, _, valeur_parametre = morceau.partition('=')
+        parametres[cle.strip().upper()] = valeur_parametre.strip('"')
+
+    return (nom.strip(), parametres, valeur)
+
+
+def lire_evenements_ics(lignes):
+    """
+    Parcourt les lignes d'un fichier .ics une seule fois
+    Renvoie (générateur) un Evenement {propriété: valeur} par événement BEGIN:VEVENT ... END:VEVENT
+    Exemple: {'UID': 'ADE6...', 'DTSTART': '20251205T090000Z', 'SUMMARY': 'SAE1.05', ...}
+    Les lignes repliées sont recollées et les paramètres (ex: ;TZID=...) sont séparés du nom
+    """
+    evenement = None
+
+    for ligne in deplier_lignes(lignes):
+        ligne = ligne.strip()
+
+        if ligne == "BEGIN:VEVENT":
+            evenement = Evenement()
+            evenement.parametres = {}
+        elif ligne == "END:VEVENT":
+            if evenement is not None:
+                yield evenement
+            evenement = None
+        elif evenement is not None:
+            nom, separateur, valeur = ligne.partition(':')
+            if not separateur:
+                continue
+            parametres = None
+            # Propriété avec paramètres (ex: DTSTART;TZID=Europe/Paris:...) : découpage complet
+            if ';' in nom:
+                nom, parametres, valeur = decouper_propriete(ligne)
+            # On garde la première occurrence d'une propriété
+            if nom not in evenement:
+                evenement[nom] = valeur.strip()
+                if parametres:
+                    evenement.parametres[nom] = parametres
+
+
+# Heure de Paris : CET (UTC+1) l'hiver, CEST (UTC+2) l'été
+HEURE_HIVER = timezone(timedelta(hours=1), "CET")
+HEURE_ETE = timezone(timedelta(hours=2), "CEST")
+
+
+def dernier_dimanche(annee, mois):
+    """Jour du dernier dimanche d'un mois de 31 jours (mars ou octobre)"""
+    return 31 - (date(annee, mois, 31).weekday() + 1) % 7
+
+
+@lru_cache(maxsize=None)
+def fuseaux_du_jour(annee, mois, jour):
+    """
+    Fuseau de Paris d'un jour UTC, avant et après 01:00 UTC : (fuseau avant, fuseau après)
+    Règle européenne : heure d'été du dernier dimanche de mars au dernier dimanche d'octobre, à 01:00 UTC
+    Les deux fuseaux ne diffèrent que les jours de changement d'heure ; calculé une seule fois par jour
+    """
+    debut_ete = (3, dernier_dimanche(annee, 3), 1)
+    fin_ete = (10, dernier_dimanche(annee, 10), 1)
+    return tuple(HEURE_ETE if debut_ete <= (mois, jour, apres) < fin_ete else HEURE_HIVER for apres in (0, 1))
+
+
+@lru_cache(maxsize=None)
+def date_ics_vers_datetime(date_ics):
+    """
+    Convertit une date ICS en datetime à l'heure de Paris (avec son fuseau CET ou CEST)
+    Exemples: 20251205T090000Z -> 2025-12-05 10:00+01:00, 20250915T070000Z -> 2025-09-15 09:00+02:00
+    Une date sans Z (ex: DTSTART;TZID=Europe/Paris:20251205T100000) est déjà à l'heure locale
+    Une date seule (journée entière, ex: 20251205) donne minuit
+    Retourne None si la date est absente ou invalide
+    """
+    if not date_ics or date_ics == "vide" or len(date_ics) < 8:
+        return None
+    try:
+        annee, mois, jour = int(date_ics[0:4]), int(date_ics[4:6]), int(date_ics[6:8])
+        heure = minute = seconde = 0
+        if len(date_ics) >= 15:
+            heure, minute, seconde = int(date_ics[9:11]), int(date_ics[11:13]), int(date_ics[13:15])
+        avant, apres = fuseaux_du_jour(annee, mois, jour)
+        if date_ics.endswith('Z'):
+            instant = datetime(annee, mois, jour, heure, minute, seconde, tzinfo=timezone.utc)
+            return instant.astimezone(apres if heure >= 1 else avant)
+        # Heure locale : le changement d'heure a lieu à 02:00 (mars) ou 03:00 (octobre) heure de Paris
+        # En octobre, 02:00-02:59 existe deux fois : on garde la première (encore en heure d'été)
+        bascule = 3 if mois == 10 else 2
+        return datetime(annee, mois, jour, heure, minute, seconde, tzinfo=apres if heure >= bascule else avant)
+    except ValueError:
+        return None
+
+
+def vers_datetime(date_ics):
+    """Accepte un datetime déjà converti ou une date ICS (convertie avec date_ics_vers_datetime)"""
+    if isinstance(date_ics, datetime):
+        return date_ics
+    return date_ics_vers_datetime(date_ics)
+
+
+def convertir_date_ics_vers_csv(date_ics):
+    """
+    Convertit une date ICS (ou un datetime) vers JJ-MM-AAAA, à l'heure de Paris
+    Exemple: 20251205T090000Z -> 05-12-2025
+    """
+    moment = vers_datetime(date_ics)
+    if moment is None:
+        return "vide"
+
+    return f"{moment.day:02d}-{moment.month:02d}-{moment.year}"
+
+
+def extraire_heure_ics(date_ics):
+    """
+    Extrait l'heure d'une date ICS (ou d'un datetime) vers HH:MM, à l'heure de Paris
+    Exemple: 20251205T090000Z -> 10:00 (UTC+1 en hiver)
+    """
+    moment = vers_datetime(date_ics)
+    if moment is None:
+        return "vide"
+
+    return f"{moment.hour:02d}:{moment.minute:02d}"
+
+
+def calculer_duree(dtstart, dtend):
+    """
+    Calcule la durée entre deux dates ICS (ou deux datetime)
+    Retourne la durée au format HH:MM (séances sur plusieurs jours ou à cheval sur un changement d'heure comprises)
+    """
+    debut, fin = vers_datetime(dtstart), vers_datetime(dtend)
+    if debut is None or fin is None or fin < debut:
+        return "vide"
+
+    heures, minutes = divmod(int((fin - debut).total_seconds()) // 60, 60)
+
+    return f"{heures:02d}:{minutes:02d}"
+
+
+def extraire_mois_de_date(date_str):
+    """Extrait le mois d'une date au format JJ-MM-AAAA"""
+    if not date_str or date_str == "vide":
+        return None
+
+    mois_dict = {
+        '01': 'Janvier', '02': 'Février', '03': 'Mars', '04': 'Avril',
+        '05': 'Mai', '06': 'Juin', '07': 'Juillet', '08': 'Août',
+        '09': 'Septembre', '10': 'Octobre', '11': 'Novembre', '12': 'Décembre'
+    }
+
+    parties = date_str.split('-')
+    if len(parties) >= 2:
+        return mois_dict.get(parties[1], None)
+
+    return None
+
+
+def extraire_modalite(summary, defaut="CM"):
+    """
+    Extrait la modalité d'enseignement du SUMMARY
+    Cherche CM, TD, TP, Proj, DS dans l'intitulé ; retourne defaut si aucune n'est trouvée
+    """
+    if not summary or summary == "vide":
+        return "vide"
+
+    modalites = ['CM', 'TD', 'TP', 'Proj', 'DS']
+    summary_upper = summary.upper()
+
+    for modalite in modalites:
+        if modalite in summary_upper:
+            return modalite
+
+    return defaut
+
+
+def modalite_des_groupes(summary, groupes, defaut="vide"):
+    """
+    Modalité d'une séance : celle de l'intitulé (voir extraire_modalite), sinon celle de ses groupes
+    ADE n'écrit souvent pas CM/TD/TP dans le SUMMARY, mais le groupe le dit : un groupe de TP -> 'TP',
+    un TD -> 'TD', la promotion entière -> 'CM' (le groupe le plus fin l'emporte)
+    Exemple: ('R1.10', [('RT1', 'TP', 'B', 2, '')]) -> 'TP'
+    """
+    modalite = extraire_modalite(summary, "")
+    if modalite and modalite != "vide":
+        return modalite
+    types = {cle[1] for cle in groupes}
+    for type_groupe, modalite in (('TP', 'TP'), ('TD', 'TD'), ('', 'CM')):
+        if type_groupe in types:
+            return modalite
+    return defaut
+
+
+# Étiquette de groupe ADE : RT1-S1 (promotion), RT1-A ou RT2-TD_C_(CYBER) (TD), RT1-TP_B2, RT1-B2 ou RT2-TP_C_FI (TP)
+# Le suffixe (_FI, _FA, _(CYBER)...) fait partie de la clé : deux groupes qui ne diffèrent que par lui restent distincts
+MOTIF_GROUPE = re.compile(r"([A-Z]+\d)(?:-(?:S\d|(TD|TP)?_?([A-Z])(\d)?(?:_(\S+))?))?")
+
+
+@lru_cache(maxsize=None)
+def normaliser_groupe(etiquette):
+    """
+    Transforme une étiquette de groupe en clé structurée (promotion, type, lettre, numéro, suffixe)
+    Exemples: 'RT1-TP_B2' -> ('RT1', 'TP', 'B', 2, ''), 'RT1-B2' -> ('RT1', 'TP', 'B', 2, '')
+              'RT1-A' -> ('RT1', 'TD', 'A', 0, ''), 'RT1-S1' -> ('RT1', '', '', 0, '')
+              'RT2-TP_C_FI' -> ('RT2', 'TP', 'C', 0, 'FI'), 'RT2-TD_C_(CYBER)' -> ('RT2', 'TD', 'C', 0, '(CYBER)')
+    Le suffixe fait partie de la clé : RT2-TP_C_FI et RT2-TP_C_FA sont deux groupes différents
+    Retourne None si l'étiquette n'est pas un groupe (professeur, matériel, date d'export...)
+    """
+    correspondance = MOTIF_GROUPE.fullmatch(etiquette.upper().strip())
+    if not correspondance:
+        return None
+    promotion, type_groupe, lettre, numero, suffixe = correspondance.groups()
+    if not lettre:
+        return (promotion, '', '', 0, '')
+    if not type_groupe:
+        type_groupe = 'TP' if numero else 'TD'
+    return (promotion, type_groupe, lettre, int(numero or 0), suffixe or '')
+
+
+def texte_groupe(cle):
+    """
+    Étiquette lisible d'une clé de groupe : ('RT1', 'TP', 'A', 1, '') -> 'RT1-TP_A1', ('RT1', 'TD', 'A', 0, '') -> 'RT1-A'
+    ('RT2', 'TP', 'C', 0, 'FI') -> 'RT2-TP_C_FI', ('RT2', 'TD', 'C', 0, '(CYBER)') -> 'RT2-TD_C_(CYBER)'
+    """
+    promotion, type_groupe, lettre, numero, suffixe = cle
+    if not type_groupe:
+        return promotion
+    if suffixe:
+        return f"{promotion}-{type_groupe}_{lettre}{numero or ''}_{suffixe}"
+    if type_groupe == 'TD':
+        return f"{promotion}-{lettre}"
+    return f"{promotion}-TP_{lettre}{numero or ''}"
+
+
+@lru_cache(maxsize=None)
+def lignee_groupe(cle):
+    """
+    Hiérarchie d'une clé de groupe, de la promotion jusqu'au groupe lui-même (promo ⊃ TD ⊃ TP)
+    Exemple: ('RT1', 'TP', 'A', 1, '') -> {('RT1', '', '', 0, ''), ('RT1', 'TD', 'A', 0, ''), ('RT1', 'TP', 'A', 1, '')}
+    Un groupe à suffixe (ex: RT2-TP_C_FI) a pour parent le TD de sa lettre sans suffixe (RT2-C)
+    """
+    promotion, type_groupe, lettre, _, _ = cle
+    lignee = {(promotion, '', '', 0, ''), cle}
+    if type_groupe:
+        lignee.add((promotion, 'TD', lettre, 0, ''))
+    return frozenset(lignee)
+
+
+def extraire_groupes(description):
+    """
+    Extrait les groupes de la DESCRIPTION sous forme de clés structurées (voir normaliser_groupe)
+    Exemple: '\\n\\nRT1-TP_A1\\nMARTINI PIERRE\\n' -> [('RT1', 'TP', 'A', 1, '')]
+    """
+    if not description or description == "vide":
+        return []
+
+    groupes = []
+    for ligne in description.replace('\\n', '\n').split('\n'):
+        cle = normaliser_groupe(ligne) if ligne.strip() else None
+        if cle is not None and cle not in groupes:
+            groupes.append(cle)
+
+    return groupes
+
+
+def appartient_au_groupe(groupes_evenement, groupe_recherche):
+    """
+    Vérifie si un événement concerne le groupe recherché
+    Un événement concerne un groupe s'ils sont dans la même lignée : une séance de promotion ou du TD A
+    concerne RT1-A1, et une séance de RT1-TP_A1 concerne le TD RT1-A et la promotion RT1
+    groupes_evenement : clés structurées ou étiquettes ; groupe_recherche : étiquette (ex: 'RT1-A1')
+    """
+    cle_recherche = normaliser_groupe(groupe_recherche)
+    if not groupes_evenement or cle_recherche is None:
+        return False
+
+    lignee_recherche = lignee_groupe(cle_recherche)
+    for groupe in groupes_evenement:
+        cle = normaliser_groupe(groupe) if isinstance(groupe, str) else groupe
+        if cle is not None and (cle in lignee_recherche or cle_recherche in lignee_groupe(cle)):
+            return True
+
+    return False
+
+
+# Code de ressource dans un SUMMARY : R1.07, R107, R 1.07, SAE1.02, SAÉ 1.05, SAE1.PORTFOLIO...
+MOTIF_RESSOURCE = re.compile(r"(?<![A-Z])(R|SA[EÉ])\s?(\d)\s?[.\-]?\s?(\d\d|[A-Z]{3,})")
+
+# Table des codes de ressource rencontrés : CODES_RESSOURCES[identifiant] -> code, IDENTIFIANTS_RESSOURCES[code] -> identifiant
+# L'identifiant 0 est réservé aux intitulés sans code de ressource
+CODES_RESSOURCES = [""]
+IDENTIFIANTS_RESSOURCES = {"": 0}
+
+
+def extraire_code_ressource(summary):
+    """
+    Extrait le code normalisé de la ressource d'un SUMMARY
+    Exemples: 'R1.07 TP' -> 'R1.07', 'R107' -> 'R1.07', 'SAE1.02 PROJET' -> 'SAE1.02'
+    Retourne "" si l'intitulé ne contient pas de code (ex: 'VISITE BU')
+    """
+    return CODES_RESSOURCES[identifiant_ressource(summary)]
+
+
+@lru_cache(maxsize=None)
+def identifiant_ressource(summary):
+    """
+    Identifiant entier (interné) du code de ressource d'un SUMMARY : 'R1.07 TP' et 'R107' -> même identifiant
+    L'intitulé n'est analysé qu'une seule fois ; les intitulés suivants identiques sont lus dans le cache
+    Retourne 0 si l'intitulé ne contient pas de code
+    """
+    if not summary or summary == "vide":
+        return 0
+    correspondance = MOTIF_RESSOURCE.search(summary.upper())
+    if not correspondance:
+        return 0
+    prefixe, semestre, numero = correspondance.groups()
+    code = f"{'R' if prefixe == 'R' else 'SAE'}{semestre}.{numero}"
+
+    identifiant = IDENTIFIANTS_RESSOURCES.get(code)
+    if identifiant is None:
+        identifiant = IDENTIFIANTS_RESSOURCES[code] = len(CODES_RESSOURCES)
+        CODES_RESSOURCES.append(code)
+    return identifiant
+
+
+def est_ressource(summary, ressource):
+    """
+    Vérifie si l'intitulé correspond à une ressource, quelle que soit l'écriture (R1.07, R107, R 1.07...)
+    La comparaison se fait entre deux identifiants entiers
+    """
+    return identifiant_ressource(summary) == identifiant_ressource(ressource) != 0
+
+
+def est_ressource_r107(summary):
+    """Vérifie si l'intitulé correspond à la ressource R1.07"""
+    return est_ressource(summary, 'R1.07')
+
+
+def extraire_professeurs(description):
+    """
+    Extrait les professeurs de la DESCRIPTION (lignes en majuscules contenant un espace)
+    Format typique: \n\nRT1-S1\nLACAN DAVID\n -> ['LACAN DAVID']
+    """
+    return extraire_description_elements(description)[0]
+
+
+def extraire_description_elements(description):
+    """
+    Extrait les groupes et professeurs de la DESCRIPTION (textes tels qu'écrits par ADE)
+    Format typique: \n\nRT1-S1\nLACAN DAVID\n
+    Retourne: (liste_profs, liste_groupes)
+    """
+    if not description or description == "vide":
+        return ([], [])
+
+    # Nettoyage de la description
+    lignes = [ligne.strip() for ligne in description.split('\\n') if ligne.strip()]
+
+    profs = []
+    groupes = []
+
+    for ligne in lignes:
+        # Si la ligne contient un espace et des majuscules, c'est probablement un prof
+        if ' ' in ligne and ligne.isupper():
+            profs.append(ligne)
+        # Si la ligne contient RT, TP, ou S, c'est probablement un groupe
+        elif any(prefix in ligne for prefix in ['RT', 'TP', 'S', 'A', 'B', 'C', 'D']):
+            groupes.append(ligne)
+
+    return (profs, groupes)
+
+
+def extraire_salles(location):
+    """Découpe le LOCATION en liste de salles (séparateur ',' échappé ou non) : 'G_002\\,D_110' -> ['G_002', 'D_110']"""
+    if not location or location == "vide":
+        return []
+    return [salle.strip() for salle in location.replace('\\,', ',').split(',') if salle.strip()]
+
+
+class Calendrier:
+    """
+    Ensemble des événements d'un fichier .ics, lu et découpé une seule fois
+    Les groupes de chaque événement sont extraits à la lecture (clés structurées, voir normaliser_groupe)
+    et réutilisés par toutes les requêtes
+    """
+
+    def __init__(self, evenements, nom_fichier="", groupes=None):
+        self.nom_fichier = nom_fichier
+        self.evenements = list(evenements)
+        if groupes is None:
+            groupes = [extraire_groupes(evenement.get('DESCRIPTION', "vide")) for evenement in self.evenements]
+        self.groupes = groupes
+        # Début et fin de chaque événement en datetime à l'heure de Paris (None si la date est absente)
+        self.debuts = [date_ics_vers_datetime(evenement.get('DTSTART', "")) for evenement in self.evenements]
+        self.fins = [date_ics_vers_datetime(evenement.get('DTEND', "")) for evenement in self.evenements]
+        # Identifiant de ressource de chaque événement (voir identifiant_ressource), 0 s'il n'y en a pas
+        self.ressources = [identifiant_ressource(evenement.get('SUMMARY', "vide")) for evenement in self.evenements]
+        # Index inversés {dimension: {valeur: ensemble des numéros d'événements}}, construits au premier besoin
+        self.index = None
+        self.cache_groupes = {}
+        # Vue en tableaux NumPy (module statistiques.py), construite au premier besoin
+        self.tableaux = None
+
+    @classmethod
+    def depuis_fichier(cls, nom_fichier, utiliser_cache=True):
+        """
+        Lit un fichier .ics ; retourne un Calendrier, ou None si le fichier est illisible
+        Si utiliser_cache est vrai, le résultat est relu depuis (ou enregistré dans) nom_fichier.cache
+        """
+        if utiliser_cache:
+            calendrier = lire_cache(nom_fichier)
+            if calendrier is not None:
+                return calendrier
+
+        lignes = lire_lignes_ics(nom_fichier)
+        if lignes is None:
+            return None
+        calendrier = cls(lire_evenements_ics(lignes), nom_fichier)
+
+        if utiliser_cache:
+            ecrire_cache(calendrier)
+        return calendrier
+
+    def __len__(self):
+        return len(self.evenements)
+
+    def __iter__(self):
+        return iter(self.evenements)
+
+    def construire_index(self):
+        """
+        Construit en un seul parcours les index inversés du calendrier :
+        groupe (clé structurée), lignee (événements d'un groupe et de ses sous-groupes),
+        ressource (R1.07, SAE1.02...), mois (AAAA-MM, heure de Paris), salle et professeur -> numéros d'événements
+        """
+        self.index = {'groupe': {}, 'lignee': {}, 'ressource': {}, 'mois': {}, 'salle': {}, 'professeur': {}}
+        index_groupe = self.index['groupe']
+        index_lignee = self.index['lignee']
+        index_ressource = self.index['ressource']
+        index_mois = self.index['mois']
+        index_salle = self.index['salle']
+        index_professeur = self.index['professeur']
+
+        for numero, (evenement, groupes, debut, ressource) in enumerate(
+                zip(self.evenements, self.groupes, self.debuts, self.ressources)):
+            for groupe in groupes:
+                index_groupe.setdefault(groupe, set()).add(numero)
+                for ancetre in lignee_groupe(groupe):
+                    index_lignee.setdefault(ancetre, set()).add(numero)
+            if ressource:
+                index_ressource.setdefault(CODES_RESSOURCES[ressource], set()).add(numero)
+            if debut is not None:
+                index_mois.setdefault(f"{debut.year}-{debut.month:02d}", set()).add(numero)
+            for salle in extraire_salles(evenement.get('LOCATION', "vide")):
+                index_salle.setdefault(salle, set()).add(numero)
+            for professeur in extraire_professeurs(evenement.get('DESCRIPTION', "vide")):
+                index_professeur.setdefault(professeur, set()).add(numero)
+
+        return self.index
+
+    def valeurs(self, dimension):
+        """Liste triée des valeurs connues d'une dimension (ex: valeurs('salle') -> ['D_028', ...])"""
+        if self.index is None:
+            self.construire_index()
+        return sorted(self.index[dimension])
+
+    def numeros_groupe(self, groupe):
+        """
+        Numéros des événements qui concernent un groupe (voir appartient_au_groupe) :
+        ceux du groupe et de ses sous-groupes (index lignee) plus ceux de ses groupes parents
+        Exemple: 'RT1-A1' -> séances de RT1-TP_A1, du TD RT1-A et de la promotion RT1
+        """
+        if self.index is None:
+            self.construire_index()
+        cle = normaliser_groupe(groupe)
+        if cle is None:
+            return set()
+        if cle not in self.cache_groupes:
+            numeros = set(self.index['lignee'].get(cle, ()))
+            for parent in lignee_groupe(cle):
+                numeros |= self.index['groupe'].get(parent, set())
+            self.cache_groupes[cle] = numeros
+        return self.cache_groupes[cle]
+
+    def numeros(self, groupe=None, ressource=None, mois=None, salle=None, professeur=None):
+        """
+        Renvoie les numéros (triés) des événements qui vérifient tous les critères donnés
+        Chaque critère est un ensemble d'index : la recherche est une intersection d'ensembles
+        Exemple: numeros(groupe='RT1-A1', ressource='R1.07', mois='2025-10')
+        """
+        if self.index is None:
+            self.construire_index()
+
+        ensembles = []
+        if groupe is not None:
+            ensembles.append(self.numeros_groupe(groupe))
+        if ressource is not None:
+            # 'R107' ou 'R 1.07' désignent la même ressource que 'R1.07'
+            ressource = extraire_code_ressource(ressource) or ressource
+        for dimension, valeur in (('ressource', ressource), ('mois', mois), ('salle', salle), ('professeur', professeur)):
+            if valeur is not None:
+                ensembles.append(self.index[dimension].get(valeur, set()))
+
+        if not ensembles:
+            return list(range(len(self.evenements)))
+
+        # On part du plus petit ensemble pour que l'intersection soit la plus rapide possible
+        ensembles.sort(key=len)
+        return sorted(ensembles[0].intersection(*ensembles[1:]))
+
+    def rechercher(self, **criteres):
+        """Renvoie les événements (dans l'ordre du fichier) qui vérifient les critères de numeros()"""
+        return [self.evenements[numero] for numero in self.numeros(**criteres)]
+
+
+def empreinte_fichier(nom_fichier):
+    """Calcule l'empreinte SHA-1 du contenu d'un fichier (lu par blocs)"""
+    empreinte = hashlib.sha1()
+    with open(nom_fichier, 'rb') as f:
+        for bloc in iter(lambda: f.read(1 << 20), b''):
+            empreinte.update(bloc)
+    return empreinte.hexdigest()
+
+
+def lire_cache(nom_fichier):
+    """
+    Relit le Calendrier enregistré dans nom_fichier.cache s'il correspond encore au fichier .ics
+    - même date de modification et même taille : le cache est utilisé directement (aucun calcul d'empreinte)
+    - même taille mais autre date (fichier recopié ou re-téléchargé) : l'empreinte SHA-1 du contenu est calculée ;
+      si elle est égale à celle du cache, seul l'en-tête est réécrit, sinon le fichier est relu et l'empreinte
+      est gardée dans le nouveau cache pour le prochain re-téléchargement à l'identique
+    Le cache est au format marshal : il ne contient que des données (dict, listes, tuples, textes)
+    et sa lecture n'exécute jamais de code, même si le fichier .cache a été remplacé
+    Retourne None si le cache est absent, illisible ou périmé
+    """
+    try:
+        infos = os.stat(nom_fichier)
+        with open(nom_fichier + ".cache", 'rb') as f:
+            entete = marshal.load(f)
+            if entete.get('version') != VERSION_CACHE or entete['taille'] != infos.st_size:
+                return None
+            empreinte = None
+            if entete['mtime'] != infos.st_mtime_ns:
+                empreinte = empreinte_fichier(nom_fichier)
+                if entete['sha1'] != empreinte:
+                    # Empreinte gardée pour le cache qui sera écrit après la relecture du fichier
+                    EMPREINTES_CONNUES[nom_fichier] = empreinte
+                    return None
+            # Le contenu est lu d'un bloc : marshal.load sur le fichier lirait objet par objet (très lent)
+            contenu = f.read()
+        schemas, valeurs_evenements, parametres, groupes = marshal.loads(contenu)
+
+        evenements = []
+        for numero, (schema, valeurs) in enumerate(zip(schemas, valeurs_evenements)):
+            evenement = Evenement(zip(schema, valeurs))
+            evenement.parametres = parametres.get(numero, {})
+            evenements.append(evenement)
+        calendrier = Calendrier(evenements, nom_fichier, groupes)
+    except (OSError, EOFError, KeyError, ValueError, TypeError, AttributeError):
+        return None
+
+    if empreinte is not None:
+        # Même contenu, autre date : on réécrit l'en-tête pour retrouver le chemin rapide
+        ecrire_fichier_cache(nom_fichier, empreinte, contenu)
+    return calendrier
+
+
+# Empreintes SHA-1 calculées par lire_cache pour des fichiers dont le cache était périmé {nom: sha1}
+EMPREINTES_CONNUES = {}
+
+
+def ecrire_fichier_cache(nom_fichier, empreinte, contenu):
+    """
+    Écrit nom_fichier.cache : en-tête (version, date de modification, taille, SHA-1 ou None) puis contenu
+    L'écriture passe par un fichier temporaire : un cache à moitié écrit n'est jamais relu
+    Une erreur d'écriture (dossier en lecture seule...) n'empêche pas le programme de continuer
+    """
+    try:
+        infos = os.stat(nom_fichier)
+        entete = {'version': VERSION_CACHE, 'mtime': infos.st_mtime_ns, 'taille': infos.st_size, 'sha1': empreinte}
+        temporaire = nom_fichier + ".cache.tmp"
+        with open(temporaire, 'wb') as f:
+            marshal.dump(entete, f)
+            f.write(contenu)
+        os.replace(temporaire, nom_fichier + ".cache")
+    except (OSError, ValueError):
+        pass
+
+
+def ecrire_cache(calendrier):
+    """
+    Enregistre les événements lus dans nom_fichier.cache (format binaire marshal, données uniquement)
+    Stockage en colonnes : les noms de propriétés sont rangés une fois par combinaison (schéma), chaque
+    événement n'est qu'un tuple de valeurs ; seuls les paramètres non vides sont gardés {numéro: paramètres}
+    L'empreinte SHA-1 n'est pas calculée ici (la date et la taille suffisent à valider le cache) :
+    seule celle déjà calculée par lire_cache est reprise
+    """
+    nom_fichier = calendrier.nom_fichier
+    schemas_connus = {}
+    schemas, valeurs_evenements, parametres = [], [], {}
+    for numero, evenement in enumerate(calendrier.evenements):
+        schema = tuple(evenement)
+        schemas.append(schemas_connus.setdefault(schema, schema))
+        valeurs_evenements.append(tuple(evenement.values()))
+        if evenement.parametres:
+            parametres[numero] = evenement.parametres
+    groupes = [tuple(groupes_evenement) for groupes_evenement in calendrier.groupes]
+    try:
+        contenu = marshal.dumps((schemas, valeurs_evenements, parametres, groupes))
+    except ValueError:
+        return
+    ecrire_fichier_cache(nom_fichier, EMPREINTES_CONNUES.pop(nom_fichier, None), contenu)
+
+
+def cle_evenement(evenement):
+    """
+    Clé d'un événement d'un export à l'autre : son UID
+    Un événement sans UID est repéré par son début, son intitulé et sa salle
+    """
+    uid = evenement.get('UID')
+    if uid:
+        return uid
+    return "sans-uid:" + "|".join(evenement.get(champ, "") for champ in ('DTSTART', 'SUMMARY', 'LOCATION'))
+
+
+def numero_sequence(evenement):
+    """Valeur entière de SEQUENCE (0 si absente ou invalide)"""
+    try:
+        return int(evenement.get('SEQUENCE', 0))
+    except ValueError:
+        return 0
+
+
+def lire_fichier_a_fusionner(nom_fichier):
+    """
+    Lit un fichier .ics pour fusionner_calendriers (exécuté dans un processus séparé)
+    Retourne (propriétés, paramètres, groupes) comme dans le cache, ou None si le fichier est illisible
+    """
+    calendrier = Calendrier.depuis_fichier(nom_fichier)
+    if calendrier is None:
+        return None
+    return ([dict(evenement) for evenement in calendrier.evenements],
+            [evenement.parametres for evenement in calendrier.evenements],
+            calendrier.groupes)
+
+
+def fusionner_calendriers(noms_fichiers, nb_processus=None):
+    """
+    Fusionne plusieurs fichiers .ics (ex: RT1, RT2, RT3 et evenementSAE_15_2025.ics) en un seul Calendrier
+    Les fichiers sont lus en parallèle (un processus par fichier, cache compris) et chacun est fusionné
+    dès qu'il est prêt, puis libéré : en plus des événements retenus, on ne garde en mémoire que les
+    fichiers lus mais pas encore fusionnés (au plus un par processus en pratique)
+    Un événement présent dans plusieurs fichiers (même UID) n'est gardé qu'une fois, dans sa version
+    de SEQUENCE la plus élevée (celle du premier fichier de la liste en cas d'égalité)
+    Les événements sont rangés dans l'ordre des fichiers, quel que soit l'ordre de fin des lectures
+    Retourne None si aucun fichier n'est lisible
+    """
+    noms_fichiers = list(noms_fichiers)
+    # {clé: (séquence, rang du fichier, (rang, position) de la première apparition, propriétés, paramètres, groupes)}
+    retenus = {}
+    lus = set()
+
+    def fusionner(rang, resultat):
+        if resultat is None:
+            return
+        lus.add(rang)
+        for position, (proprietes, parametres, groupes) in enumerate(zip(*resultat)):
+            cle = cle_evenement(proprietes)
+            sequence = numero_sequence(proprietes)
+            deja_vu = retenus.get(cle)
+            if deja_vu is None:
+                retenus[cle] = (sequence, rang, (rang, position), proprietes, parametres, groupes)
+            elif sequence > deja_vu[0] or (sequence == deja_vu[0] and rang < deja_vu[1]):
+                retenus[cle] = (sequence, rang, min(deja_vu[2], (rang, position)), proprietes, parametres, groupes)
+            elif (rang, position) < deja_vu[2]:
+                retenus[cle] = deja_vu[:2] + ((rang, position),) + deja_vu[3:]
+
+    if len(noms_fichiers) > 1 and nb_processus != 1:
+        with ProcessPoolExecutor(max_workers=nb_processus) as executeur:
+            rangs = {executeur.submit(lire_fichier_a_fusionner, nom_fichier): rang
+                     for rang, nom_fichier in enumerate(noms_fichiers)}
+            for futur in as_completed(rangs):
+                # Le futur est oublié après la fusion : le contenu du fichier peut être libéré
+                fusionner(rangs.pop(futur), futur.result())
+                del futur
+    else:
+        for rang, nom_fichier in enumerate(noms_fichiers):
+            fusionner(rang, lire_fichier_a_fusionner(nom_fichier))
+
+    if not lus:
+        return None
+
+    evenements, groupes_evenements = [], []
+    for _, _, _, proprietes, parametres, groupes in sorted(retenus.values(), key=lambda retenu: retenu[2]):
+        evenement = Evenement(proprietes)
+        evenement.parametres = parametres
+        evenements.append(evenement)
+        groupes_evenements.append(groupes)
+    return Calendrier(evenements, " + ".join(noms_fichiers[rang] for rang in sorted(lus)), groupes_evenements)
+
+
+def charger_calendrier(source):
+    """
+    Retourne un Calendrier à partir d'un nom de fichier .ics ou d'un Calendrier déjà lu
+    Permet aux fonctions des programmes d'accepter l'un ou l'autre sans relire le fichier
+    Une liste de noms de fichiers donne leur fusion (voir fusionner_calendriers)
+    """
+    if isinstance(source, Calendrier):
+        return source
+    if isinstance(source, (list, tuple)):
+        if len(source) == 1:
+            return Calendrier.depuis_fichier(source[0])
+        return fusionner_calendriers(source)
+    return Calendrier.depuis_fichier(source)
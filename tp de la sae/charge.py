@@ -0,0 +1,208 @@
+"""
+charge.py
+Cube de charge d'enseignement : heures et nombre de séances par professeur x ressource x modalité x mois x semaine
+Le cube est construit en un seul parcours du Calendrier (module calendrier.py) : chaque valeur de dimension
+est remplacée par un code entier, et les séances identiques sur toutes les dimensions sont cumulées dans une cellule
+Les questions (« heures de chaque professeur en TP », « heures de R1.07 par mois »...) sont ensuite des
+regroupements (roll-up) et des filtres (slice) sur les cellules, sans relire ni reparcourir les événements
+Exemples :
+    python charge.py --par professeur
+    python charge.py --par ressource --par mois --modalite TP --csv charge_tp.csv
+    python charge.py --par professeur --par modalite --html charge.html
+    python charge.py --fichier ADE_RT1_Septembre2025_Decembre2025.ics --fichier evenementSAE_15_2025.ics
+"""
+
+import csv
+from html import escape
+
+from calendrier import CODES_RESSOURCES, charger_calendrier, extraire_professeurs, identifiant_ressource, modalite_des_groupes
+
+# Dimensions du cube, dans l'ordre des codes d'une cellule
+DIMENSIONS = ('professeur', 'ressource', 'modalite', 'mois', 'semaine')
+
+# Valeurs utilisées quand un événement n'a pas de professeur ou pas de code de ressource
+SANS_PROFESSEUR = "(aucun)"
+SANS_RESSOURCE = "(autre)"
+
+
+class CubeCharge:
+    """
+    Cube des heures d'enseignement
+    - codes[dimension] : {valeur: code entier} ; etiquettes[dimension] : liste des valeurs (indice = code)
+    - cellules : {(code professeur, code ressource, code modalité, code mois, code semaine): [heures, séances]}
+    Une séance assurée par deux professeurs compte entièrement pour chacun d'eux
+    """
+
+    def __init__(self, source):
+        self.codes = {dimension: {} for dimension in DIMENSIONS}
+        self.etiquettes = {dimension: [] for dimension in DIMENSIONS}
+        self.cellules = {}
+
+        calendrier = charger_calendrier(source)
+        if calendrier is None:
+            return
+
+        for evenement, groupes, debut, fin, ressource in zip(calendrier.evenements, calendrier.groupes, calendrier.debuts,
+                                                             calendrier.fins, calendrier.ressources):
+            if debut is None or fin is None:
+                continue
+            heures = (fin - debut).total_seconds() / 3600
+            summary = evenement.get('SUMMARY', "vide")
+            annee_iso, semaine_iso, _ = debut.isocalendar()
+
+            code_ressource = self.coder('ressource', CODES_RESSOURCES[ressource] or SANS_RESSOURCE)
+            # Modalité de l'intitulé, sinon celle des groupes (ADE n'écrit pas toujours CM/TD/TP dans le titre)
+            code_modalite = self.coder('modalite', modalite_des_groupes(summary, groupes))
+            code_mois = self.coder('mois', f"{debut.year}-{debut.month:02d}")
+            code_semaine = self.coder('semaine', f"{annee_iso}-S{semaine_iso:02d}")
+
+            professeurs = extraire_professeurs(evenement.get('DESCRIPTION', "vide")) or [SANS_PROFESSEUR]
+            for professeur in professeurs:
+                cle = (self.coder('professeur', professeur), code_ressource, code_modalite, code_mois, code_semaine)
+                cellule = self.cellules.get(cle)
+                if cellule is None:
+                    self.cellules[cle] = [heures, 1]
+                else:
+                    cellule[0] += heures
+                    cellule[1] += 1
+
+    def coder(self, dimension, valeur):
+        """Code entier d'une valeur (attribué à la première rencontre) : coder('modalite', 'TP') -> 2"""
+        codes = self.codes[dimension]
+        code = codes.get(valeur)
+        if code is None:
+            code = codes[valeur] = len(codes)
+            self.etiquettes[dimension].append(valeur)
+        return code
+
+    def cumuler(self, dimensions=(), **filtres):
+        """
+        Regroupe les cellules selon les dimensions gardées, après filtrage
+        filtres : dimension=valeur ou dimension=[valeurs] (ex: modalite='TP', mois=['2025-09', '2025-10'])
+        Une ressource peut être écrite comme dans ADE ou non : 'R107' et 'R 1.07' désignent R1.07
+        Retourne {tuple des valeurs des dimensions gardées: (heures, séances)}, trié par valeurs
+        Exemple: cumuler(['professeur'], modalite='TP') -> {('MARTINI PIERRE',): (96.0, 48), ...}
+        """
+        positions = [DIMENSIONS.index(dimension) for dimension in dimensions]
+
+        # Filtres traduits une fois en ensembles de codes
+        codes_filtres = []
+        for dimension, valeurs in filtres.items():
+            if isinstance(valeurs, str):
+                valeurs = [valeurs]
+            if dimension == 'ressource':
+                valeurs = [CODES_RESSOURCES[identifiant_ressource(valeur)] or valeur for valeur in valeurs]
+            codes = self.codes[dimension]
+            codes_filtres.append((DIMENSIONS.index(dimension), {codes[valeur] for valeur in valeurs if valeur in codes}))
+
+        totaux = {}
+        for cle, (heures, seances) in self.cellules.items():
+            if any(cle[position] not in codes for position, codes in codes_filtres):
+                continue
+            groupe = tuple(cle[position] for position in positions)
+            total = totaux.get(groupe)
+            if total is None:
+                totaux[groupe] = [heures, seances]
+            else:
+                total[0] += heures
+                total[1] += seances
+
+        resultat = {}
+        for groupe, (heures, seances) in totaux.items():
+            valeurs = tuple(self.etiquettes[dimension][code] for dimension, code in zip(dimensions, groupe))
+            resultat[valeurs] = (heures, seances)
+        return dict(sorted(resultat.items()))
+
+    def exporter_csv(self, nom_fichier, dimensions, **filtres):
+        """Écrit le résultat de cumuler() dans un fichier CSV (séparateur ';') ; retourne le nombre de lignes"""
+        lignes = self.cumuler(dimensions, **filtres)
+        with open(nom_fichier, 'w', encoding='utf-8', newline='') as f:
+            ecrivain = csv.writer(f, delimiter=';')
+            ecrivain.writerow([*dimensions, "Heures", "Séances"])
+            for valeurs, (heures, seances) in lignes.items():
+                ecrivain.writerow([*valeurs, f"{heures:g}", seances])
+        return len(lignes)
+
+    def exporter_html(self, nom_fichier, dimensions, **filtres):
+        """
+        Écrit un tableau HTML : tableau croisé si deux dimensions (lignes x colonnes, avec totaux),
+        sinon une ligne par combinaison de valeurs ; retourne le nombre de lignes
+        """
+        lignes = self.cumuler(dimensions, **filtres)
+        titre = "Charge d'enseignement (heures) par " + " x ".join(dimensions)
+        if filtres:
+            titre += " — " + ", ".join(f"{dimension} = {valeurs}" for dimension, valeurs in filtres.items())
+
+        parties = ['<!DOCTYPE html>\n<html lang="fr">\n<head>\n<meta charset="UTF-8">\n',
+                   f'<title>{escape(titre)}</title>\n<style>\n',
+                   'body { font-family: "Segoe UI", Tahoma, sans-serif; margin: 30px; color: #333; }\n',
+                   'table { border-collapse: collapse; } th, td { border: 1px solid #ddd; padding: 6px 12px; }\n',
+                   'th { background: #667eea; color: white; } td.nombre { text-align: right; }\n',
+                   'tr:nth-child(even) { background: #f8f9fa; } .total { font-weight: bold; }\n',
+                   f'</style>\n</head>\n<body>\n<h1>{escape(titre)}</h1>\n<table>\n']
+
+        if len(dimensions) == 2:
+            # Tableau croisé : première dimension en lignes, seconde en colonnes
+            valeurs_lignes = sorted({valeurs[0] for valeurs in lignes})
+            valeurs_colonnes = sorted({valeurs[1] for valeurs in lignes})
+            parties.append(f'<tr><th>{escape(dimensions[0])}</th>')
+            parties.extend(f'<th>{escape(colonne)}</th>' for colonne in valeurs_colonnes)
+            parties.append('<th>Total</th></tr>\n')
+            for ligne in valeurs_lignes:
+                heures_ligne = [lignes.get((ligne, colonne), (0, 0))[0] for colonne in valeurs_colonnes]
+                parties.append(f'<tr><td>{escape(ligne)}</td>')
+                parties.extend(f'<td class="nombre">{heures:g}</td>' if heures else '<td></td>' for heures in heures_ligne)
+                parties.append(f'<td class="nombre total">{sum(heures_ligne):g}</td></tr>\n')
+            parties.append('<tr class="total"><td>Total</td>')
+            parties.extend(f'<td class="nombre">{sum(lignes.get((ligne, colonne), (0, 0))[0] for ligne in valeurs_lignes):g}</td>'
+                           for colonne in valeurs_colonnes)
+            parties.append(f'<td class="nombre">{sum(heures for heures, _ in lignes.values()):g}</td></tr>\n')
+        else:
+            parties.append('<tr>' + ''.join(f'<th>{escape(dimension)}</th>' for dimension in dimensions))
+            parties.append('<th>Heures</th><th>Séances</th></tr>\n')
+            for valeurs, (heures, seances) in lignes.items():
+                parties.append('<tr>' + ''.join(f'<td>{escape(valeur)}</td>' for valeur in valeurs))
+                parties.append(f'<td class="nombre">{heures:g}</td><td class="nombre">{seances}</td></tr>\n')
+
+        parties.append('</table>\n</body>\n</html>\n')
+        with open(nom_fichier, 'w', encoding='utf-8') as f:
+            f.write(''.join(parties))
+        return len(lignes)
+
+
+# Programme principal
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Charge d'enseignement (heures) par professeur, ressource, modalité...")
+    parser.add_argument('--fichier', action='append',
+                        help="fichier .ics à analyser (répétable : les fichiers sont fusionnés, "
+                             "défaut ADE_RT1_Septembre2025_Decembre2025.ics)")
+    parser.add_argument('--par', action='append', choices=DIMENSIONS, default=[],
+                        help="dimension gardée (répétable), ex: --par professeur --par mois")
+    for dimension in DIMENSIONS:
+        parser.add_argument(f'--{dimension}', action='append', help=f"ne garder que ce(s) {dimension}(s)")
+    parser.add_argument('--csv', help="exporter le résultat dans ce fichier CSV")
+    parser.add_argument('--html', help="exporter le résultat dans ce fichier HTML")
+    arguments = parser.parse_args()
+
+    cube = CubeCharge(arguments.fichier or ["ADE_RT1_Septembre2025_Decembre2025.ics"])
+    dimensions = arguments.par or ['professeur']
+    filtres = {dimension: getattr(arguments, dimension) for dimension in DIMENSIONS if getattr(arguments, dimension)}
+
+    if not cube.cellules:
+        print("Aucune séance (fichier illisible ou vide).")
+    else:
+        lignes = cube.cumuler(dimensions, **filtres)
+        print(f"{'  '.join(f'{dimension:<25}' for dimension in dimensions)} {'Heures':>8} {'Séances':>8}")
+        print("-" * (27 * len(dimensions) + 18))
+        for valeurs, (heures, seances) in lignes.items():
+            print(f"{'  '.join(f'{valeur:<25}' for valeur in valeurs)} {heures:8g} {seances:8d}")
+        print("-" * (27 * len(dimensions) + 18))
+        print(f"{'TOTAL':<{27 * len(dimensions) - 2}} {sum(h for h, _ in lignes.values()):8g} "
+              f"{sum(s for _, s in lignes.values()):8d}")
+
+        if arguments.csv:
+            print(f"\n✓ {cube.exporter_csv(arguments.csv, dimensions, **filtres)} ligne(s) écrite(s) dans {arguments.csv}")
+        if arguments.html:
+            print(f"✓ {cube.exporter_html(arguments.html, dimensions, **filtres)} ligne(s) écrite(s) dans {arguments.html}")
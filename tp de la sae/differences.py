@@ -0,0 +1,198 @@
+"""
+differences.py
+Comparaison de deux exports ADE (fichiers .ics) d'un même emploi du temps
+Chaque événement est rangé dans un dictionnaire par UID (identifiant stable d'ADE) : la comparaison
+se fait en un seul parcours de chaque calendrier, O(n), et donne les séances ajoutées, supprimées et modifiées
+Les numéros d'événements touchés permettent ensuite de ne régénérer que les rapports concernés
+(voir python 4.py --tous --depuis ANCIEN.ics)
+Exemples :
+    python differences.py ancien.ics nouveau.ics
+    python differences.py ancien.ics nouveau.ics --csv changements.csv
+"""
+
+import csv
+
+from calendrier import charger_calendrier, convertir_date_ics_vers_csv, extraire_heure_ics, calculer_duree
+from calendrier import cle_evenement, numero_sequence, extraire_groupes, texte_groupe
+from occupation import detecter_conflits
+
+# Propriétés qui décrivent la séance elle-même (DTSTAMP, CREATED... changent à chaque export)
+CHAMPS_CONTENU = ('DTSTART', 'DTEND', 'SUMMARY', 'LOCATION', 'DESCRIPTION')
+
+# Propriétés de version : si elles sont identiques dans les deux exports, la séance n'a pas changé
+# ADE les met à la date de l'export pour tous les événements : le contenu est alors comparé
+CHAMPS_VERSION = ('SEQUENCE', 'LAST-MODIFIED')
+
+
+def indexer_par_uid(calendrier):
+    """
+    Dictionnaire {clé de l'événement: numéro}
+    Si une clé apparaît plusieurs fois, même règle que fusionner_calendriers : la plus grande SEQUENCE
+    est gardée, et à SEQUENCE égale la première apparition
+    """
+    index = {}
+    for numero, evenement in enumerate(calendrier.evenements):
+        cle = cle_evenement(evenement)
+        deja_vu = index.get(cle)
+        if deja_vu is None or numero_sequence(evenement) > numero_sequence(calendrier.evenements[deja_vu]):
+            index[cle] = numero
+    return index
+
+
+def champs_modifies(ancien, nouveau):
+    """
+    Liste des propriétés de contenu qui diffèrent entre deux versions d'un événement
+    Retourne [] si la séance n'a pas changé (SEQUENCE et LAST-MODIFIED identiques, ou même contenu)
+    """
+    if all(champ in ancien for champ in CHAMPS_VERSION) and \
+            all(ancien[champ] == nouveau.get(champ) for champ in CHAMPS_VERSION):
+        return []
+    return [champ for champ in CHAMPS_CONTENU if ancien.get(champ, "") != nouveau.get(champ, "")]
+
+
+def comparer_calendriers(ancien, nouveau):
+    """
+    Compare deux calendriers (Calendrier ou nom de fichier .ics)
+    Retourne un dict :
+    - 'ajoutes' : numéros (dans le nouveau) des séances qui n'existaient pas
+    - 'supprimes' : numéros (dans l'ancien) des séances qui ont disparu
+    - 'modifies' : [(numéro dans l'ancien, numéro dans le nouveau, [propriétés modifiées]), ...]
+    Retourne None si l'un des deux fichiers est illisible
+    """
+    ancien = charger_calendrier(ancien)
+    nouveau = charger_calendrier(nouveau)
+    if ancien is None or nouveau is None:
+        return None
+
+    index_ancien = indexer_par_uid(ancien)
+    ajoutes, modifies = [], []
+    restants = set(index_ancien)
+
+    for cle, numero in indexer_par_uid(nouveau).items():
+        numero_ancien = index_ancien.get(cle)
+        if numero_ancien is None:
+            ajoutes.append(numero)
+            continue
+        restants.discard(cle)
+        champs = champs_modifies(ancien.evenements[numero_ancien], nouveau.evenements[numero])
+        if champs:
+            modifies.append((numero_ancien, numero, champs))
+
+    return {
+        'ajoutes': sorted(ajoutes),
+        'supprimes': sorted(index_ancien[cle] for cle in restants),
+        'modifies': sorted(modifies),
+    }
+
+
+def signatures_conflits(calendrier, conflits):
+    """
+    Conflits rendus comparables d'un calendrier à l'autre : les numéros d'événements sont remplacés par leurs clés
+    Retourne {(dimension, valeur, clés des deux séances, début, fin): numéros}
+    """
+    signatures = {}
+    for conflit in conflits:
+        cles = frozenset(cle_evenement(calendrier.evenements[numero]) for numero in conflit['numeros'])
+        signatures[(conflit['dimension'], conflit['valeur'], cles, conflit['debut'], conflit['fin'])] = conflit['numeros']
+    return signatures
+
+
+def numeros_touches(ancien, nouveau, differences):
+    """
+    Numéros des événements dont un rapport peut dépendre : (ensemble dans l'ancien, ensemble dans le nouveau)
+    En plus des séances ajoutées, supprimées ou modifiées, on garde les séances des conflits apparus ou disparus :
+    une séance déplacée dans une salle déjà occupée change aussi le rapport de l'autre groupe
+    """
+    ancien = charger_calendrier(ancien)
+    nouveau = charger_calendrier(nouveau)
+    touches_ancien = set(differences['supprimes'])
+    touches_nouveau = set(differences['ajoutes'])
+    for numero_ancien, numero_nouveau, _ in differences['modifies']:
+        touches_ancien.add(numero_ancien)
+        touches_nouveau.add(numero_nouveau)
+
+    conflits_ancien = signatures_conflits(ancien, detecter_conflits(ancien))
+    conflits_nouveau = signatures_conflits(nouveau, detecter_conflits(nouveau))
+    for signature in conflits_ancien.keys() - conflits_nouveau.keys():
+        touches_ancien.update(conflits_ancien[signature])
+    for signature in conflits_nouveau.keys() - conflits_ancien.keys():
+        touches_nouveau.update(conflits_nouveau[signature])
+    return touches_ancien, touches_nouveau
+
+
+def groupes_touches(ancien, nouveau, groupes, differences):
+    """
+    Groupes (ex: 'RT1-A1') dont le rapport doit être régénéré : ceux qui ont au moins une séance touchée
+    dans l'ancien ou dans le nouveau calendrier (une séance de TD RT1-A touche RT1-A1 et RT1-A2)
+    """
+    ancien = charger_calendrier(ancien)
+    nouveau = charger_calendrier(nouveau)
+    touches_ancien, touches_nouveau = numeros_touches(ancien, nouveau, differences)
+    return {groupe for groupe in groupes
+            if not touches_ancien.isdisjoint(ancien.numeros_groupe(groupe))
+            or not touches_nouveau.isdisjoint(nouveau.numeros_groupe(groupe))}
+
+
+def decrire_evenement(evenement):
+    """Description courte d'une séance : '15-12-2025 16:00 (2h) R1.10 [RT1-TP_B2] D_028'"""
+    dtstart = evenement.get('DTSTART', "")
+    groupes = ", ".join(texte_groupe(cle) for cle in extraire_groupes(evenement.get('DESCRIPTION', "vide")))
+    return (f"{convertir_date_ics_vers_csv(dtstart)} {extraire_heure_ics(dtstart)} "
+            f"({calculer_duree(dtstart, evenement.get('DTEND', ''))}) {evenement.get('SUMMARY', 'vide')} "
+            f"[{groupes}] {evenement.get('LOCATION', '')}")
+
+
+def lignes_changements(ancien, nouveau, differences):
+    """
+    Une ligne par changement : (type, clé, date, heure, durée, intitulé, salle, propriétés modifiées)
+    Pour une séance supprimée, les valeurs sont celles de l'ancien calendrier
+    """
+    def ligne(type_changement, evenement, champs=()):
+        dtstart = evenement.get('DTSTART', "")
+        return (type_changement, cle_evenement(evenement), convertir_date_ics_vers_csv(dtstart),
+                extraire_heure_ics(dtstart), calculer_duree(dtstart, evenement.get('DTEND', "")),
+                evenement.get('SUMMARY', "vide"), evenement.get('LOCATION', ""), ",".join(champs))
+
+    lignes = [ligne("ajout", nouveau.evenements[numero]) for numero in differences['ajoutes']]
+    lignes += [ligne("suppression", ancien.evenements[numero]) for numero in differences['supprimes']]
+    lignes += [ligne("modification", nouveau.evenements[numero_nouveau], champs)
+               for _, numero_nouveau, champs in differences['modifies']]
+    return lignes
+
+
+def afficher_differences(ancien, nouveau, differences):
+    """Affiche les séances ajoutées (+), supprimées (-) et modifiées (~, avant puis après)"""
+    print(f"{len(differences['ajoutes'])} ajout(s), {len(differences['supprimes'])} suppression(s), "
+          f"{len(differences['modifies'])} modification(s)")
+    for numero in differences['ajoutes']:
+        print(f"  + {decrire_evenement(nouveau.evenements[numero])}")
+    for numero in differences['supprimes']:
+        print(f"  - {decrire_evenement(ancien.evenements[numero])}")
+    for numero_ancien, numero_nouveau, champs in differences['modifies']:
+        print(f"  ~ {decrire_evenement(ancien.evenements[numero_ancien])}")
+        print(f"    → {decrire_evenement(nouveau.evenements[numero_nouveau])} ({', '.join(champs)})")
+
+
+# Programme principal
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Différences entre deux exports ADE (.ics)")
+    parser.add_argument('ancien', help="export précédent (.ics)")
+    parser.add_argument('nouveau', help="nouvel export (.ics)")
+    parser.add_argument('--csv', help="écrire les séances changées dans ce fichier CSV")
+    arguments = parser.parse_args()
+
+    calendrier_ancien = charger_calendrier(arguments.ancien)
+    calendrier_nouveau = charger_calendrier(arguments.nouveau)
+    if calendrier_ancien is not None and calendrier_nouveau is not None:
+        differences = comparer_calendriers(calendrier_ancien, calendrier_nouveau)
+        afficher_differences(calendrier_ancien, calendrier_nouveau, differences)
+
+        if arguments.csv:
+            lignes = lignes_changements(calendrier_ancien, calendrier_nouveau, differences)
+            with open(arguments.csv, 'w', encoding='utf-8', newline='') as f:
+                ecrivain = csv.writer(f, delimiter=';')
+                ecrivain.writerow(["Changement", "UID", "Date", "Heure", "Durée", "Intitulé", "Salle", "Modifié"])
+                ecrivain.writerows(lignes)
+            print(f"\n✓ {len(lignes)} ligne(s) écrite(s) dans {arguments.csv}")
@@ -0,0 +1,382 @@
+"""
+graphique.py
+Moteur de graphiques en barres commun à python 3.py (PNG) et python 4.py (SVG)
+La mise en page (échelle, graduations, position des barres) est calculée une seule fois
+à partir des séries, puis écrite en SVG (liste de morceaux joints à la fin) ou en PNG (Toile)
+Les séries peuvent être de n'importe quelle longueur : mois, semaines, année universitaire, groupes empilés...
+AUCUNE BIBLIOTHÈQUE EXTERNE REQUISE
+"""
+
+import math
+import struct
+import zlib
+from html import escape
+
+# Couleurs des barres (une par étiquette pour une série simple, une par série pour des barres empilées)
+COULEURS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E9']
+
+# Mois d'une année universitaire, dans l'ordre
+ANNEE_UNIVERSITAIRE = ['Septembre', 'Octobre', 'Novembre', 'Décembre', 'Janvier', 'Février',
+                       'Mars', 'Avril', 'Mai', 'Juin', 'Juillet', 'Août']
+
+
+def ordre_mois(compteur_mois, premier='Septembre', dernier='Décembre'):
+    """
+    Liste ordonnée des mois à afficher : de premier à dernier, élargie aux mois présents dans le compteur
+    Exemple: {'Octobre': 12, 'Janvier': 3} -> ['Septembre', 'Octobre', 'Novembre', 'Décembre', 'Janvier']
+    """
+    rangs = [ANNEE_UNIVERSITAIRE.index(premier), ANNEE_UNIVERSITAIRE.index(dernier)]
+    rangs += [ANNEE_UNIVERSITAIRE.index(mois) for mois, nombre in compteur_mois.items()
+              if nombre and mois in ANNEE_UNIVERSITAIRE]
+    return ANNEE_UNIVERSITAIRE[min(rangs):max(rangs) + 1]
+
+
+def nombre_svg(valeur):
+    """Coordonnée SVG au centième de pixel, sans zéros inutiles : 112.5 -> '112.5', 80.0 -> '80'"""
+    return f"{round(valeur, 2):g}"
+
+
+def couleur_rgb(couleur):
+    """Convertit une couleur '#RRGGBB' en triplet (R, G, B) : '#FF6B6B' -> (255, 107, 107)"""
+    return tuple(int(couleur[i:i + 2], 16) for i in (1, 3, 5))
+
+
+def pas_graduations(echelle_max, nombre_max=20):
+    """Pas entre deux graduations de l'axe Y (1, 2, 5, 10, 20, 50...) pour en afficher au plus nombre_max"""
+    pas = 1
+    while echelle_max / pas > nombre_max:
+        for facteur in (2, 5, 10):
+            if echelle_max / (pas * facteur) <= nombre_max:
+                return pas * facteur
+        pas *= 10
+    return pas
+
+
+class Graphique:
+    """
+    Graphique en barres : une barre par étiquette, un segment par série (barres empilées)
+    series : liste de valeurs (une seule série) ou dict {nom de série: liste de valeurs}
+    marges : (haut, droite, bas, gauche) en pixels ; echelle multiplie toutes les dimensions (PNG haute densité)
+    La mise en page est calculée dans __init__ ; vers_svg() et vers_toile() ne font que l'écrire
+    Les positions sont des flottants (SVG) : le PNG les arrondit au pixel, avec des barres d'au moins 1 pixel
+    """
+
+    def __init__(self, etiquettes, series, largeur=800, hauteur=600, marges=(100, 50, 100, 80),
+                 couleurs=None, titre_x="", titre_y="", echelle=1):
+        self.etiquettes = list(etiquettes)
+        if isinstance(series, dict):
+            self.series = {nom: list(valeurs) for nom, valeurs in series.items()}
+        else:
+            self.series = {"": list(series)}
+        self.couleurs = couleurs or COULEURS
+        self.titre_x = titre_x
+        self.titre_y = titre_y
+        self.echelle = echelle
+
+        self.largeur = largeur * echelle
+        self.hauteur = hauteur * echelle
+        self.marge_haut, self.marge_droite, self.marge_bas, self.marge_gauche = (m * echelle for m in marges)
+        self.zone_largeur = self.largeur - self.marge_gauche - self.marge_droite
+        self.zone_hauteur = self.hauteur - self.marge_haut - self.marge_bas
+        self.y_axe = self.hauteur - self.marge_bas
+
+        self.calculer_mise_en_page()
+
+    def calculer_mise_en_page(self):
+        """
+        Calcule en un seul parcours des séries :
+        - echelle_max et les graduations [(valeur, y)]
+        - les barres [(étiquette, x_gauche, x_droite, y_haut, total)]
+        - les segments [(x_gauche, y_haut, x_droite, y_bas, couleur)] et la légende [(série, couleur)]
+        - pas_etiquettes : une étiquette (et une valeur) sur pas_etiquettes est écrite quand les barres sont serrées
+        """
+        nb_barres = max(len(self.etiquettes), 1)
+        totaux = [sum(valeurs[i] for valeurs in self.series.values() if i < len(valeurs))
+                  for i in range(len(self.etiquettes))]
+
+        max_val = max(totaux) if totaux and max(totaux) > 0 else 5
+        self.echelle_max = max_val + 2
+        pas = pas_graduations(self.echelle_max)
+        self.graduations = [(i, self.position_y(i)) for i in range(0, int(self.echelle_max) + 1, pas)]
+
+        # En flottants : avec une division entière, la largeur des barres tombe à 0 au-delà de ~375 barres
+        self.espace = self.zone_largeur / nb_barres
+        largeur_barre = self.espace / 2
+        self.pas_etiquettes = max(1, math.ceil(16 * self.echelle / self.espace))
+        empile = len(self.series) > 1
+        self.legende = [(nom, self.couleurs[k % len(self.couleurs)]) for k, nom in enumerate(self.series)] if empile else []
+
+        self.barres = []
+        self.segments = []
+        for i, (etiquette, total) in enumerate(zip(self.etiquettes, totaux)):
+            x_centre = self.marge_gauche + self.espace * (i + 0.5)
+            x_gauche = x_centre - largeur_barre / 2
+            x_droite = x_centre + largeur_barre / 2
+            self.barres.append((etiquette, x_gauche, x_droite, self.position_y(total), total))
+
+            cumul = 0
+            for k, valeurs in enumerate(self.series.values()):
+                valeur = valeurs[i] if i < len(valeurs) else 0
+                if not valeur and empile:
+                    continue
+                couleur = self.couleurs[(k if empile else i) % len(self.couleurs)]
+                self.segments.append((x_gauche, self.position_y(cumul + valeur), x_droite, self.position_y(cumul), couleur))
+                cumul += valeur
+
+    def position_y(self, valeur):
+        """Ordonnée (en pixels, vers le bas) du haut d'une barre de hauteur valeur"""
+        return self.y_axe - (valeur * self.zone_hauteur) / self.echelle_max
+
+    def vers_svg(self):
+        """Écrit le graphique en SVG : chaque élément est ajouté à une liste, jointe une seule fois à la fin"""
+        largeur, hauteur = self.largeur, self.hauteur
+        gauche, droite, haut, y_axe = self.marge_gauche, self.largeur - self.marge_droite, self.marge_haut, self.y_axe
+        parties = [f'<svg width="{largeur}" height="{hauteur}" xmlns="http://www.w3.org/2000/svg">',
+                   f'<rect width="{largeur}" height="{hauteur}" fill="white"/>']
+
+        # Grille
+        for valeur, y in self.graduations:
+            parties.append(f'<line x1="{gauche}" y1="{nombre_svg(y)}" x2="{droite}" y2="{nombre_svg(y)}" '
+                           f'stroke="#e0e0e0" stroke-width="1"/>')
+            parties.append(f'<text x="{gauche - 20}" y="{nombre_svg(y + 5)}" text-anchor="end" font-size="14">{valeur}</text>')
+
+        # Axes
+        parties.append(f'<line x1="{gauche}" y1="{haut}" x2="{gauche}" y2="{y_axe}" stroke="black" stroke-width="2"/>')
+        parties.append(f'<line x1="{gauche}" y1="{y_axe}" x2="{droite}" y2="{y_axe}" stroke="black" stroke-width="2"/>')
+        if self.titre_y:
+            y_titre = (haut + y_axe) // 2
+            parties.append(f'<text x="50" y="{y_titre}" font-size="16" font-weight="bold" '
+                           f'transform="rotate(-90 50 {y_titre})" text-anchor="middle">{escape(self.titre_y)}</text>')
+        if self.titre_x:
+            parties.append(f'<text x="{gauche + self.zone_largeur // 2}" y="{hauteur - 30}" font-size="16" '
+                           f'font-weight="bold" text-anchor="middle">{escape(self.titre_x)}</text>')
+
+        # Barres (un rectangle par segment), puis valeurs et étiquettes
+        # La bordure est omise quand elle recouvrirait toute la barre (barres très serrées)
+        bordure = ' stroke="black" stroke-width="2"' if self.espace / 2 > 4 else ''
+        for x_gauche, y_haut, x_droite, y_bas, couleur in self.segments:
+            parties.append(f'<rect x="{nombre_svg(x_gauche)}" y="{nombre_svg(y_haut)}" '
+                           f'width="{nombre_svg(x_droite - x_gauche)}" height="{nombre_svg(y_bas - y_haut)}" '
+                           f'fill="{couleur}"{bordure}/>')
+
+        # Étiquettes inclinées si les barres sont trop serrées (ex: une barre par semaine),
+        # et une sur pas_etiquettes seulement si elles se chevaucheraient
+        taille_valeur = 18 if self.espace >= 60 else 11
+        incline = self.espace < 90
+        for etiquette, x_gauche, x_droite, y_haut, total in self.barres[::self.pas_etiquettes]:
+            x_milieu = nombre_svg((x_gauche + x_droite) / 2)
+            parties.append(f'<text x="{x_milieu}" y="{nombre_svg(y_haut - 10)}" text-anchor="middle" '
+                           f'font-size="{taille_valeur}" font-weight="bold">{total:g}</text>')
+            if incline:
+                parties.append(f'<text x="{x_milieu}" y="{y_axe + 20}" text-anchor="end" font-size="12" '
+                               f'transform="rotate(-45 {x_milieu} {y_axe + 20})">{escape(str(etiquette))}</text>')
+            else:
+                parties.append(f'<text x="{x_milieu}" y="{y_axe + 30}" text-anchor="middle" '
+                               f'font-size="14">{escape(str(etiquette))}</text>')
+
+        # Légende des séries empilées (en haut à droite)
+        for k, (nom, couleur) in enumerate(self.legende):
+            y = 20 + 20 * k
+            parties.append(f'<rect x="{droite - 150}" y="{y}" width="14" height="14" fill="{couleur}" stroke="black"/>')
+            parties.append(f'<text x="{droite - 130}" y="{y + 12}" font-size="13">{escape(str(nom))}</text>')
+
+        parties.append('</svg>')
+        return ''.join(parties)
+
+    def vers_toile(self):
+        """
+        Dessine le graphique sur une Toile (PNG) : axes, grille pointillée, barres bordées de noir
+        Le PNG ne contient pas de texte (pas de police de caractères sans bibliothèque externe)
+        """
+        image = Toile(self.largeur, self.hauteur)
+        noir = (0, 0, 0)
+        epaisseur = self.echelle
+        gauche, droite, haut, y_axe = self.marge_gauche, self.largeur - self.marge_droite, self.marge_haut, self.y_axe
+
+        # Axe Y (vertical) puis axe X (horizontal)
+        image.remplir(gauche, haut, gauche + 2 * epaisseur, y_axe, noir)
+        image.remplir(gauche, y_axe - 2 * epaisseur + 1, droite, y_axe + 1, noir)
+
+        # Grille horizontale pointillée
+        for _, y in self.graduations:
+            y = round(y)
+            if haut <= y < y_axe:
+                for trait in range(epaisseur):
+                    image.pointilles(gauche, droite, y + trait, (220, 220, 220), 2 * epaisseur)
+
+        # Segments des barres
+        for x_gauche, y_haut, x_droite, y_bas, couleur in self.segments:
+            x_gauche, x_droite = self.colonnes_png(x_gauche, x_droite)
+            image.remplir(x_gauche, max(haut, round(y_haut)), x_droite, round(y_bas), couleur_rgb(couleur))
+
+        # Bordure noire autour de chaque barre (sauf si elle recouvrirait toute la barre)
+        for _, x_gauche, x_droite, y_haut, _ in self.barres:
+            x_gauche, x_droite = self.colonnes_png(x_gauche, x_droite)
+            if x_droite - x_gauche <= 2 * epaisseur:
+                continue
+            y_haut = round(y_haut)
+            y_remplissage = max(haut, y_haut)
+            if y_haut >= haut:
+                image.remplir(x_gauche, y_haut, x_droite, y_haut + epaisseur, noir)
+            image.remplir(x_gauche, y_axe - epaisseur, x_droite, y_axe, noir)
+            image.remplir(x_gauche, y_remplissage, x_gauche + epaisseur, y_axe, noir)
+            image.remplir(x_droite - epaisseur, y_remplissage, x_droite, y_axe, noir)
+
+        return image
+
+    @staticmethod
+    def colonnes_png(x_gauche, x_droite):
+        """Colonnes de pixels [x_gauche, x_droite[ d'une barre : arrondies, et au moins 1 pixel de large"""
+        x_gauche = round(x_gauche)
+        return x_gauche, max(round(x_droite), x_gauche + 1)
+
+    def ecrire_png(self, nom_fichier, niveau_compression=6):
+        """Écrit le graphique dans un fichier PNG (voir ecrire_png)"""
+        ecrire_png(self.vers_toile(), nom_fichier, niveau_compression)
+
+
+class Toile:
+    """
+    Image RGB stockée dans un seul bytearray, ligne par ligne, au format brut attendu par PNG :
+    chaque ligne commence par l'octet de filtre (0 = aucun) suivi de 3 octets (R, G, B) par pixel
+    Les rectangles et les lignes sont remplis ligne par ligne par affectation de tranches
+    """
+
+    def __init__(self, largeur, hauteur, fond=(255, 255, 255)):
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.pas_ligne = 1 + 3 * largeur
+        ligne = b'\x00' + bytes(fond) * largeur
+        self.pixels = bytearray(ligne * hauteur)
+
+    def remplir(self, x0, y0, x1, y1, couleur):
+        """Remplit le rectangle [x0, x1[ x [y0, y1[ (coupé aux bords de l'image)"""
+        x0, x1 = max(x0, 0), min(x1, self.largeur)
+        y0, y1 = max(y0, 0), min(y1, self.hauteur)
+        if x0 >= x1 or y0 >= y1:
+            return
+        segment = bytes(couleur) * (x1 - x0)
+        debut = y0 * self.pas_ligne + 1 + 3 * x0
+        for y in range(y0, y1):
+            self.pixels[debut:debut + len(segment)] = segment
+            debut += self.pas_ligne
+
+    def pointilles(self, x0, x1, y, couleur, pas=2):
+        """Ligne horizontale pointillée : un pixel sur 'pas' (ceux dont x est multiple de pas) entre x0 et x1"""
+        x0, x1 = max(x0, 0), min(x1, self.largeur)
+        x0 += -x0 % pas
+        if not 0 <= y < self.hauteur or x0 >= x1:
+            return
+        nombre = len(range(x0, x1, pas))
+        debut = y * self.pas_ligne + 1 + 3 * x0
+        for canal in range(3):
+            # Tranche étendue : un octet tous les 3 * pas, pour chaque canal R, G puis B
+            self.pixels[debut + canal:debut + 3 * (x1 - x0):3 * pas] = bytes([couleur[canal]]) * nombre
+
+
+def soustraire_octets(a, b, masque_haut):
+    """
+    Soustraction octet par octet (modulo 256) de deux lignes codées en entiers (grand-boutiste)
+    Technique « SWAR » : le bit de poids fort de chaque octet est traité à part, il n'y a donc
+    jamais de retenue d'un octet sur l'autre et toute la ligne est calculée en une opération
+    """
+    return ((a | masque_haut) - (b & ~masque_haut)) ^ ((a ^ b ^ masque_haut) & masque_haut)
+
+
+def lignes_filtrees_png(image):
+    """
+    Renvoie (générateur) les lignes de la Toile, chacune précédée de son octet de filtre PNG
+    Pour chaque ligne, on garde le filtre qui donne le plus d'octets nuls (les plus compressibles) :
+    0 (aucun), 1 (Sub : différence avec le pixel de gauche) ou 2 (Up : différence avec la ligne du dessus)
+    Sur un graphique en aplats de couleur, Sub et Up donnent des lignes presque entièrement nulles
+    """
+    taille = 3 * image.largeur
+    masque_haut = int.from_bytes(b'\x80' * taille, 'big')
+    pixels = memoryview(image.pixels)
+    ligne_identique = b'\x02' + bytes(taille)
+    precedente = -1
+
+    for y in range(image.hauteur):
+        debut = y * image.pas_ligne + 1
+        ligne = pixels[debut:debut + taille]
+        valeur = int.from_bytes(ligne, 'big')
+
+        # Ligne identique à celle du dessus (cas le plus fréquent) : Up donne une ligne nulle
+        if valeur == precedente:
+            yield ligne_identique
+            continue
+
+        meilleure = b'\x00' + ligne
+        # Sub : le pixel de gauche est la même ligne décalée de 3 octets (24 bits)
+        for filtre, reference in ((1, valeur >> 24), (2, max(precedente, 0))):
+            candidate = soustraire_octets(valeur, reference, masque_haut).to_bytes(taille, 'big')
+            if candidate.count(0) >= meilleure.count(0):
+                meilleure = bytes([filtre]) + candidate
+
+        precedente = valeur
+        yield meilleure
+
+
+def ecrire_png(image, nom_fichier, niveau_compression=6, filtrer=True, taille_idat=1 << 16):
+    """
+    Écrit une Toile au format PNG (format simplifié)
+    niveau_compression : niveau zlib de 0 à 9 (6 : bon compromis ; 9 est lent et ne gagne presque rien ici)
+    filtrer : choisit un filtre PNG par ligne (sinon le bytearray de la Toile est compressé directement, sans copie)
+    Les données sont compressées ligne par ligne et écrites en chunks IDAT d'environ taille_idat octets :
+    l'image compressée n'est jamais entièrement en mémoire
+    """
+    # En-tête PNG
+    png_signature = b'\x89PNG\r\n\x1a\n'
+
+    # IHDR chunk (information sur l'image)
+    ihdr_data = struct.pack('>IIBBBBB', image.largeur, image.hauteur, 8, 2, 0, 0, 0)
+    ihdr_chunk = creer_chunk(b'IHDR', ihdr_data)
+
+    # IEND chunk (fin du fichier)
+    iend_chunk = creer_chunk(b'IEND', b'')
+
+    # Écrire le fichier
+    with open(nom_fichier, 'wb') as f:
+        f.write(png_signature)
+        f.write(ihdr_chunk)
+
+        # IDAT chunks (données de l'image), compressés au fil de l'eau
+        compresseur = zlib.compressobj(niveau_compression)
+        lignes = lignes_filtrees_png(image) if filtrer else [memoryview(image.pixels)]
+        tampon = bytearray()
+        for ligne in lignes:
+            tampon += compresseur.compress(ligne)
+            if len(tampon) >= taille_idat:
+                f.write(creer_chunk(b'IDAT', bytes(tampon)))
+                tampon.clear()
+        tampon += compresseur.flush()
+        f.write(creer_chunk(b'IDAT', bytes(tampon)))
+
+        f.write(iend_chunk)
+
+
+def creer_chunk(chunk_type, data):
+    """Crée un chunk PNG"""
+    length = len(data)
+    crc = zlib.crc32(chunk_type + data) & 0xffffffff
+    return struct.pack('>I', length) + chunk_type + data + struct.pack('>I', crc)
+
+
+# Vérification : python graphique.py
+if __name__ == "__main__":
+    # Chaque barre doit être dessinée, y compris quand il y en a presque autant que de pixels de large
+    for nb_barres in (5, 52, 400, 670):
+        valeurs = [1 + i % 7 for i in range(nb_barres)]
+        graphique = Graphique([f"S{i}" for i in range(nb_barres)], valeurs)
+
+        largeurs_svg = [x_droite - x_gauche for x_gauche, _, x_droite, _, _ in graphique.segments]
+        assert len(largeurs_svg) == nb_barres and min(largeurs_svg) > 0, f"{nb_barres} barres : barre SVG vide"
+
+        image = graphique.vers_toile()
+        for i, (_, x_gauche, x_droite, _, _) in enumerate(graphique.barres):
+            x_gauche, x_droite = graphique.colonnes_png(x_gauche, x_droite)
+            x, y = (x_gauche + x_droite - 1) // 2, round(graphique.position_y(valeurs[i] / 2))
+            debut = y * image.pas_ligne + 1 + 3 * x
+            couleur = COULEURS[i % len(COULEURS)]
+            assert tuple(image.pixels[debut:debut + 3]) == couleur_rgb(couleur), f"{nb_barres} barres : barre {i} absente du PNG"
+        print(f"✓ {nb_barres} barre(s) dessinée(s) en SVG et en PNG")
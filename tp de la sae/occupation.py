@@ -0,0 +1,364 @@
+"""
+occupation.py
+Occupation des salles, des professeurs et des groupes à partir d'un Calendrier (module calendrier.py)
+Détection des doubles réservations par balayage (sweep-line) : les séances de chaque salle, professeur
+ou groupe sont triées une fois par heure de début, puis parcourues en gardant les séances « en cours »
+dans un tas trié par heure de fin. Coût O(n log n + nombre de conflits) au lieu de comparer tous les couples
+Recherche de créneaux libres : les périodes occupées de chaque salle, professeur ou groupe sont fusionnées
+et triées une fois (IndexOccupation), chaque question est ensuite une recherche dichotomique
+Exemples :
+    python occupation.py conflits
+    python occupation.py salles-libres --debut "2025-10-14 14:00" --fin "2025-10-14 16:00"
+    python occupation.py creneaux --groupe RT1-TP_A1 --groupe RT1-TP_B2 --debut 2025-10-13 --fin 2025-10-17
+    python occupation.py --fichier ADE_RT1_Septembre2025_Decembre2025.ics --fichier evenementSAE_15_2025.ics conflits
+"""
+
+import heapq
+from bisect import bisect_right
+from datetime import timedelta
+
+from calendrier import charger_calendrier, convertir_date_ics_vers_csv, extraire_heure_ics, calculer_duree
+from calendrier import date_ics_vers_datetime, lignee_groupe, normaliser_groupe, texte_groupe
+
+# Dimensions dans lesquelles une même valeur ne peut pas être à deux endroits en même temps
+DIMENSIONS = ('salle', 'professeur', 'groupe')
+
+
+def groupes_feuilles(calendrier):
+    """
+    Groupes du calendrier qui n'ont pas de sous-groupe (les TP, ou un TD/une promotion non découpés)
+    Deux séances de RT1-TP_A1 et RT1-TP_A2 en même temps ne sont pas un conflit pour le TD RT1-A :
+    les conflits de groupe sont donc cherchés sur les groupes feuilles (avec leurs groupes parents)
+    """
+    cles = calendrier.valeurs('groupe')
+    parents = {parent for cle in cles for parent in lignee_groupe(cle) if parent != cle}
+    return [cle for cle in cles if cle not in parents]
+
+
+def intervalles(source, dimension):
+    """
+    Séances de chaque valeur d'une dimension ('salle', 'professeur' ou 'groupe'), triées par début
+    Retourne {valeur: [(début, fin, numéro d'événement), ...]} ; les séances sans date sont ignorées
+    Exemple: intervalles(calendrier, 'salle')['G_002'] -> [(datetime(...), datetime(...), 17), ...]
+    """
+    calendrier = charger_calendrier(source)
+    if calendrier is None:
+        return {}
+    if calendrier.index is None:
+        calendrier.construire_index()
+
+    if dimension == 'groupe':
+        ensembles = {}
+        for cle in groupes_feuilles(calendrier):
+            etiquette = texte_groupe(cle)
+            ensembles[etiquette] = calendrier.numeros_groupe(etiquette)
+    else:
+        ensembles = calendrier.index[dimension]
+
+    debuts, fins = calendrier.debuts, calendrier.fins
+    resultat = {}
+    for valeur, numeros in ensembles.items():
+        resultat[valeur] = sorted((debuts[numero], fins[numero], numero) for numero in numeros
+                                  if debuts[numero] is not None and fins[numero] is not None
+                                  and debuts[numero] < fins[numero])
+    return resultat
+
+
+def chevauchements(intervalles_tries):
+    """
+    Balayage d'une liste [(début, fin, numéro)] triée par début
+    Renvoie (générateur) les couples qui se chevauchent : (numéro a, numéro b, début commun, fin commune)
+    Deux séances qui se suivent (fin de l'une = début de l'autre) ne se chevauchent pas
+    """
+    en_cours = []
+    for debut, fin, numero in intervalles_tries:
+        # On retire les séances terminées avant le début de celle-ci
+        while en_cours and en_cours[0][0] <= debut:
+            heapq.heappop(en_cours)
+        for fin_en_cours, numero_en_cours in en_cours:
+            yield numero_en_cours, numero, debut, min(fin, fin_en_cours)
+        heapq.heappush(en_cours, (fin, numero))
+
+
+def detecter_conflits(source, dimensions=DIMENSIONS):
+    """
+    Liste des doubles réservations du calendrier, triée par date
+    Chaque conflit est un dict {'dimension', 'valeur', 'numeros': (a, b), 'debut', 'fin'}
+    Pour les groupes, un même couple de séances n'est signalé qu'une fois (ex: valeur 'RT1-TP_A1, RT1-TP_A2')
+    """
+    calendrier = charger_calendrier(source)
+    if calendrier is None:
+        return []
+
+    conflits = []
+    for dimension in dimensions:
+        par_couple = {}
+        for valeur, liste in intervalles(calendrier, dimension).items():
+            for a, b, debut, fin in chevauchements(liste):
+                couple = (min(a, b), max(a, b))
+                if couple in par_couple:
+                    par_couple[couple]['valeur'] += f", {valeur}"
+                else:
+                    par_couple[couple] = {'dimension': dimension, 'valeur': valeur, 'numeros': couple,
+                                          'debut': debut, 'fin': fin}
+        conflits.extend(par_couple.values())
+
+    conflits.sort(key=lambda conflit: (conflit['debut'], conflit['dimension'], conflit['numeros']))
+    return conflits
+
+
+def conflits_du_groupe(source, conflits, groupe):
+    """Garde les conflits dont au moins une des deux séances concerne le groupe (ex: 'RT1-A1')"""
+    calendrier = charger_calendrier(source)
+    if calendrier is None:
+        return []
+    numeros_groupe = calendrier.numeros_groupe(groupe)
+    return [conflit for conflit in conflits if numeros_groupe.intersection(conflit['numeros'])]
+
+
+def decrire_conflit(calendrier, conflit):
+    """
+    Résumé lisible d'un conflit : dict {'date', 'horaire', 'type', 'concerne', 'seance_a', 'seance_b'}
+    Exemple: {'date': '14-10-2025', 'horaire': '10:00-12:00', 'type': 'salle', 'concerne': 'G_002', ...}
+    """
+    a, b = conflit['numeros']
+    return {
+        'date': convertir_date_ics_vers_csv(conflit['debut']),
+        'horaire': f"{extraire_heure_ics(conflit['debut'])}-{extraire_heure_ics(conflit['fin'])}",
+        'type': conflit['dimension'],
+        'concerne': conflit['valeur'],
+        'seance_a': calendrier.evenements[a].get('SUMMARY', "vide"),
+        'seance_b': calendrier.evenements[b].get('SUMMARY', "vide"),
+    }
+
+
+def fusionner_intervalles(intervalles_tries):
+    """
+    Fusionne des intervalles [(début, fin, ...)] triés par début en périodes occupées disjointes
+    Retourne deux listes parallèles (débuts, fins), triées, utilisables avec bisect
+    """
+    debuts, fins = [], []
+    for debut, fin, *_ in intervalles_tries:
+        if fins and debut <= fins[-1]:
+            fins[-1] = max(fins[-1], fin)
+        else:
+            debuts.append(debut)
+            fins.append(fin)
+    return debuts, fins
+
+
+def lire_date_heure(texte, heure_par_defaut="00:00"):
+    """
+    Lit une date saisie ('AAAA-MM-JJ HH:MM', 'JJ/MM/AAAA HH:MM', heure facultative) à l'heure de Paris
+    Exemple: '2025-10-14 14:00' -> datetime(2025, 10, 14, 14, 0, tzinfo=CEST) ; None si la saisie est invalide
+    """
+    morceaux = texte.strip().split()
+    jour_texte = morceaux[0] if morceaux else ""
+    heure_texte = morceaux[1] if len(morceaux) > 1 else heure_par_defaut
+    try:
+        if '/' in jour_texte:
+            jour, mois, annee = jour_texte.split('/')
+        else:
+            annee, mois, jour = jour_texte.split('-')
+        heure, _, minute = heure_texte.replace('h', ':').partition(':')
+        return date_ics_vers_datetime(f"{int(annee):04d}{int(mois):02d}{int(jour):02d}T"
+                                      f"{int(heure):02d}{int(minute or 0):02d}00")
+    except ValueError:
+        return None
+
+
+def lire_heure(texte):
+    """Lit une heure saisie ('14:00', '8h30', '9') : (heure, minute), ou None si elle est invalide"""
+    heure, _, minute = texte.strip().replace('h', ':').partition(':')
+    try:
+        heure, minute = int(heure), int(minute or 0)
+    except ValueError:
+        return None
+    if 0 <= heure < 24 and 0 <= minute < 60:
+        return heure, minute
+    return None
+
+
+def plages_journalieres(debut, fin, ouverture="08:00", fermeture="18:30", week_end=False):
+    """
+    Découpe [début, fin[ en plages d'ouverture quotidiennes (ex: 08:00-18:30, du lundi au vendredi)
+    Renvoie (générateur) des couples (début, fin) à l'heure de Paris ; aucun si une heure est invalide
+    """
+    heures = lire_heure(ouverture), lire_heure(fermeture)
+    if None in heures:
+        return
+    (heure_ouverture, minute_ouverture), (heure_fermeture, minute_fermeture) = heures
+
+    jour = debut.date()
+    while jour <= fin.date():
+        if week_end or jour.weekday() < 5:
+            texte = f"{jour.year:04d}{jour.month:02d}{jour.day:02d}T"
+            plage_debut = max(debut, date_ics_vers_datetime(f"{texte}{heure_ouverture:02d}{minute_ouverture:02d}00"))
+            plage_fin = min(fin, date_ics_vers_datetime(f"{texte}{heure_fermeture:02d}{minute_fermeture:02d}00"))
+            if plage_debut < plage_fin:
+                yield plage_debut, plage_fin
+        jour += timedelta(days=1)
+
+
+class IndexOccupation:
+    """
+    Index des périodes occupées de chaque salle, professeur ou groupe : listes triées de débuts et de fins
+    (périodes fusionnées, donc disjointes) ; chaque question est une recherche dichotomique (bisect)
+    Les index sont construits à la première question sur une valeur, puis gardés
+    """
+
+    def __init__(self, source):
+        self.calendrier = charger_calendrier(source)
+        self.index = {}
+
+    def valeurs(self, dimension):
+        """Salles, professeurs ou groupes connus (groupes : étiquettes des groupes feuilles)"""
+        if dimension == 'groupe':
+            return [texte_groupe(cle) for cle in groupes_feuilles(self.calendrier)]
+        return self.calendrier.valeurs(dimension)
+
+    def periodes_occupees(self, dimension, valeur):
+        """
+        Retourne (débuts, fins) des périodes occupées d'une valeur
+        Pour un groupe, les séances de ses groupes parents et de ses sous-groupes comptent
+        (ex: 'RT1-A' est occupé dès qu'un de ses TP l'est)
+        Lève ValueError si aucune séance du calendrier ne concerne la valeur (groupe mal écrit, salle inconnue...) :
+        elle serait sinon annoncée libre en permanence
+        """
+        if dimension == 'groupe':
+            cle = normaliser_groupe(valeur)
+            if cle is None:
+                raise ValueError(f"Groupe invalide : {valeur}")
+            valeur = texte_groupe(cle)
+        if (dimension, valeur) not in self.index:
+            if dimension == 'groupe':
+                numeros = self.calendrier.numeros_groupe(valeur)
+            else:
+                numeros = self.calendrier.numeros(**{dimension: valeur})
+            if not numeros:
+                raise ValueError(f"Aucune séance dans le calendrier pour : {dimension} {valeur}")
+            debuts, fins = self.calendrier.debuts, self.calendrier.fins
+            self.index[(dimension, valeur)] = fusionner_intervalles(sorted(
+                (debuts[numero], fins[numero]) for numero in numeros
+                if debuts[numero] is not None and fins[numero] is not None))
+        return self.index[(dimension, valeur)]
+
+    def occupations(self, dimension, valeur, debut, fin):
+        """Périodes occupées [(début, fin)] qui coupent [début, fin[ : O(log n + nombre de périodes)"""
+        debuts, fins = self.periodes_occupees(dimension, valeur)
+        # Première période qui se termine après le début demandé
+        i = bisect_right(fins, debut)
+        resultat = []
+        while i < len(debuts) and debuts[i] < fin:
+            resultat.append((debuts[i], fins[i]))
+            i += 1
+        return resultat
+
+    def est_libre(self, dimension, valeur, debut, fin):
+        """Vrai si la valeur (ex: salle 'G_002') n'a aucune séance entre début et fin : O(log n)"""
+        debuts, fins = self.periodes_occupees(dimension, valeur)
+        i = bisect_right(fins, debut)
+        return i == len(debuts) or debuts[i] >= fin
+
+    def libres(self, dimension, debut, fin):
+        """Valeurs d'une dimension libres sur tout [début, fin[ (ex: libres('salle', mardi 14h, mardi 16h))"""
+        return [valeur for valeur in self.valeurs(dimension) if self.est_libre(dimension, valeur, debut, fin)]
+
+    def creneaux_libres(self, dimension, valeurs, debut, fin, duree_minimale=timedelta(0), **plages):
+        """
+        Créneaux où toutes les valeurs (ex: les groupes ['RT1-TP_A1', 'RT1-TP_B2']) sont libres en même temps
+        Les créneaux sont cherchés dans les plages d'ouverture (voir plages_journalieres) de [début, fin[
+        et doivent durer au moins duree_minimale ; retourne une liste [(début, fin)]
+        """
+        creneaux = []
+        for plage_debut, plage_fin in plages_journalieres(debut, fin, **plages):
+            # Périodes occupées de toutes les valeurs sur la plage, fusionnées en une seule liste triée
+            occupees = sorted(periode for valeur in valeurs
+                              for periode in self.occupations(dimension, valeur, plage_debut, plage_fin))
+            curseur = plage_debut
+            for occupee_debut, occupee_fin in occupees:
+                if occupee_debut > curseur and occupee_debut - curseur >= duree_minimale:
+                    creneaux.append((curseur, occupee_debut))
+                curseur = max(curseur, occupee_fin)
+            if plage_fin > curseur and plage_fin - curseur >= duree_minimale:
+                creneaux.append((curseur, plage_fin))
+        return creneaux
+
+
+def afficher_creneaux(creneaux):
+    """Affiche une liste de créneaux [(début, fin)] : JJ-MM-AAAA HH:MM-HH:MM (durée)"""
+    if not creneaux:
+        print("Aucun créneau libre.")
+    for debut, fin in creneaux:
+        print(f"  {convertir_date_ics_vers_csv(debut)} {extraire_heure_ics(debut)}-{extraire_heure_ics(fin)} "
+              f"({calculer_duree(debut, fin)})")
+
+
+# Programme principal
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Conflits et créneaux libres des salles, professeurs et groupes")
+    parser.add_argument('--fichier', action='append',
+                        help="fichier .ics à analyser (répétable : les fichiers sont fusionnés, "
+                             "défaut ADE_RT1_Septembre2025_Decembre2025.ics)")
+    sous_commandes = parser.add_subparsers(dest='commande')
+    sous_commandes.add_parser('conflits', help="lister les doubles réservations (par défaut)")
+    parser_salles = sous_commandes.add_parser('salles-libres', help="salles libres sur une période")
+    parser_creneaux = sous_commandes.add_parser('creneaux', help="créneaux libres communs à des groupes/salles")
+    for sous_parser in (parser_salles, parser_creneaux):
+        sous_parser.add_argument('--debut', required=True, help="ex: '2025-10-14 14:00' ou '14/10/2025 14h'")
+        sous_parser.add_argument('--fin', required=True, help="ex: '2025-10-14 16:00' (jour seul : jusqu'à 23:59)")
+    parser_creneaux.add_argument('--groupe', action='append', default=[], help="groupe (répétable), ex: RT1-TP_A1")
+    parser_creneaux.add_argument('--salle', action='append', default=[], help="salle (répétable), ex: G_002")
+    parser_creneaux.add_argument('--duree', type=int, default=60, help="durée minimale en minutes (défaut 60)")
+    parser_creneaux.add_argument('--ouverture', default="08:00", help="heure d'ouverture (défaut 08:00)")
+    parser_creneaux.add_argument('--fermeture', default="18:30", help="heure de fermeture (défaut 18:30)")
+    arguments = parser.parse_args()
+
+    calendrier = charger_calendrier(arguments.fichier or ["ADE_RT1_Septembre2025_Decembre2025.ics"])
+
+    if calendrier is None:
+        print("Échec de la lecture du fichier.")
+    elif arguments.commande in (None, 'conflits'):
+        conflits = detecter_conflits(calendrier)
+        print(f"{len(calendrier)} événement(s), {len(conflits)} conflit(s) détecté(s)")
+        for dimension in DIMENSIONS:
+            print(f"  - {dimension:<12} : {sum(1 for conflit in conflits if conflit['dimension'] == dimension)}")
+
+        print()
+        for conflit in conflits:
+            details = decrire_conflit(calendrier, conflit)
+            print(f"{details['date']} {details['horaire']}  {details['type']:<10} {details['concerne']:<25} "
+                  f"{details['seance_a']} / {details['seance_b']}")
+    else:
+        debut = lire_date_heure(arguments.debut)
+        fin = lire_date_heure(arguments.fin, "23:59")
+        index = IndexOccupation(calendrier)
+        heures_valides = arguments.commande != 'creneaux' or (lire_heure(arguments.ouverture) is not None
+                                                              and lire_heure(arguments.fermeture) is not None)
+        if debut is None or fin is None or fin <= debut or not heures_valides:
+            print("Période invalide.")
+        elif arguments.commande == 'salles-libres':
+            salles = index.libres('salle', debut, fin)
+            print(f"{len(salles)} salle(s) libre(s) :")
+            for salle in salles:
+                print(f"  {salle}")
+        else:
+            # Un groupe ou une salle inconnu(e) n'a aucune séance : il (elle) serait annoncé(e) libre toute la journée
+            for dimension, valeurs in (('groupe', arguments.groupe), ('salle', arguments.salle)):
+                for valeur in valeurs:
+                    try:
+                        index.periodes_occupees(dimension, valeur)
+                    except ValueError as erreur:
+                        parser_creneaux.error(str(erreur))
+            duree = timedelta(minutes=arguments.duree)
+            plages = {'ouverture': arguments.ouverture, 'fermeture': arguments.fermeture}
+            creneaux = index.creneaux_libres('groupe', arguments.groupe, debut, fin, duree, **plages)
+            if arguments.salle:
+                # Intersection des créneaux libres des groupes avec ceux des salles
+                creneaux = [creneau for plage_debut, plage_fin in creneaux
+                            for creneau in index.creneaux_libres('salle', arguments.salle, plage_debut, plage_fin,
+                                                                 duree, ouverture="00:00", fermeture="23:59")]
+            print(f"Créneaux libres communs ({', '.join(arguments.groupe + arguments.salle)}) :")
+            afficher_creneaux(creneaux)
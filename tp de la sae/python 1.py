@@ -1,133 +1,26 @@
 ##Programme1.py ##
 ##Conversion d'un fichier .ics (un seul événement) vers le format pseudo-csv ##
 
-def lire_fichier_ics(nom_fichier):
-    try:
-        with open(nom_fichier, 'r', encoding='utf-8') as fichier:
-            contenu = fichier.read()
-        return contenu
-    except FileNotFoundError:
-        print(f"Erreur : Le fichier {nom_fichier} n'a pas été trouvé.")
-        return None
-    except Exception as e:
-        print(f"Erreur lors de la lecture du fichier : {e}")
-        return None
-
-
-def extraire_propriete(contenu, identificateur):
-    ##Extrait la valeur d'une propriété à partir de son identificateur##
-    lignes = contenu.split('\n')
-    for ligne in lignes:
-        if ligne.startswith(identificateur + ':'):
-            return ligne.split(':', 1)[1].strip()
-    return ""
-
-
-def convertir_date_ics_vers_csv(date_ics):
-    ##Convertit une date au format AAAAMMDDThhmmssZ vers JJ-MM-AAAA##
-    ##Exemple: 20251205T090000Z -> 05-12-2025##
-    if not date_ics or len(date_ics) < 15:
-        return ""
-    
-    annee = date_ics[0:4]
-    mois = date_ics[4:6]
-    jour = date_ics[6:8]
-    
-    return f"{jour}-{mois}-{annee}"
-
-
-def extraire_heure_ics(date_ics):
-    ##Extrait l'heure d'une date au format AAAAMMDDThhmmssZ vers HH:MM##
-    ##Exemple: 20251205T090000Z -> 09:00##
-    if not date_ics or len(date_ics) < 15:
-        return ""
-    
-    heure = date_ics[9:11]
-    minutes = date_ics[11:13]
-    
-    return f"{heure}:{minutes}"
-
-
-def calculer_duree(dtstart, dtend):
-    ##Calcule la durée entre deux dates au format AAAAMMDDThhmmssZ##
-    ##Retourne la durée au format HH:MM##
-    if not dtstart or not dtend:
-        return "00:00"
-    
-    # Extraction des heures et minutes de début
-    heure_debut = int(dtstart[9:11])
-    min_debut = int(dtstart[11:13])
-    
-    # Extraction des heures et minutes de fin
-    heure_fin = int(dtend[9:11])
-    min_fin = int(dtend[11:13])
-    
-    # Calcul de la durée en minutes
-    total_min_debut = heure_debut * 60 + min_debut
-    total_min_fin = heure_fin * 60 + min_fin
-    duree_minutes = total_min_fin - total_min_debut
-    
-    # Conversion en heures et minutes
-    heures = duree_minutes // 60
-    minutes = duree_minutes % 60
-    
-    return f"{heures:02d}:{minutes:02d}"
-
-
-def extraire_modalite(summary):
-
-    ##Extrait la modalité d'enseignement du SUMMARY##
-    ##Cherche CM, TD, TP, Proj, DS dans l'intitulé##
-    
-    modalites = ['CM', 'TD', 'TP', 'Proj', 'DS']
-    summary_upper = summary.upper()
-    
-    for modalite in modalites:
-        if modalite in summary_upper:
-            return modalite
-    
-    return "CM"  # Par défaut
-
-
-def extraire_description_elements(description):
-    
-    ###Extrait les groupes et professeurs de la DESCRIPTION###
-    ###Format typique: \n\nRT1-S1\nLACAN DAVID\n###
-    ###Retourne: (liste_profs, liste_groupes)###
-    if not description:
-        return ([], [])
-    
-    # Nettoyage de la description
-    lignes = [ligne.strip() for ligne in description.split('\\n') if ligne.strip()]
-    
-    profs = []
-    groupes = []
-    
-    for ligne in lignes:
-        # Si la ligne contient un espace et des majuscules, c'est probablement un prof
-        if ' ' in ligne and ligne.isupper():
-            profs.append(ligne)
-        # Si la ligne contient RT, TP, ou S, c'est probablement un groupe
-        elif any(prefix in ligne for prefix in ['RT', 'TP', 'S']):
-            groupes.append(ligne)
-    
-    return (profs, groupes)
+from calendrier import Calendrier, convertir_date_ics_vers_csv, extraire_heure_ics, calculer_duree, extraire_modalite
+from calendrier import extraire_description_elements
 
 
 def convertir_ics_vers_csv(nom_fichier):
     ###Fonction principale qui convertit un fichier .ics en format pseudo-csv###
-    # Lecture du fichier
-    contenu = lire_fichier_ics(nom_fichier)
-    if contenu is None:
+    # Lecture du fichier (module commun calendrier.py)
+    # Fichier d'un seul événement : pas de fichier .cache à côté
+    calendrier = Calendrier.depuis_fichier(nom_fichier, utiliser_cache=False)
+    if calendrier is None or len(calendrier) == 0:
         return None
+    evenement = calendrier.evenements[0]
     
     # Extraction des propriétés
-    uid = extraire_propriete(contenu, 'UID')
-    dtstart = extraire_propriete(contenu, 'DTSTART')
-    dtend = extraire_propriete(contenu, 'DTEND')
-    summary = extraire_propriete(contenu, 'SUMMARY')
-    location = extraire_propriete(contenu, 'LOCATION')
-    description = extraire_propriete(contenu, 'DESCRIPTION')
+    uid = evenement.get('UID', "")
+    dtstart = evenement.get('DTSTART', "")
+    dtend = evenement.get('DTEND', "")
+    summary = evenement.get('SUMMARY', "")
+    location = evenement.get('LOCATION', "")
+    description = evenement.get('DESCRIPTION', "")
     
     # Conversion des dates et heures
     date = convertir_date_ics_vers_csv(dtstart)
@@ -174,179 +67,56 @@ if __name__ == "__main__":
 
 """
 Programme2.py
-Conversion d'un fichier .ics (plusieurs événements) vers le format pseudo-csv
-Retourne un tableau de chaînes pseudo-csv
+Conversion d'un fichier .ics (plusieurs événements) vers le format csv
+Les lignes sont écrites avec le module csv (champs contenant ';' ou '"' mis entre guillemets), éventuellement en gzip
+Avec --depuis ANCIEN.ics, le fichier CSV déjà écrit est mis à jour : seules les séances ajoutées ou modifiées
+depuis cet export sont reconverties (voir differences.py)
 """
 
-def lire_fichier_ics(nom_fichier):
-    """Lit le contenu d'un fichier .ics et retourne son contenu sous forme de chaîne"""
-    try:
-        with open(nom_fichier, 'r', encoding='utf-8') as fichier:
-            contenu = fichier.read()
-        return contenu
-    except FileNotFoundError:
-        print(f"Erreur : Le fichier {nom_fichier} n'a pas été trouvé.")
-        return None
-    except Exception as e:
-        print(f"Erreur lors de la lecture du fichier : {e}")
-        return None
-
-
-def extraire_evenements(contenu):
-    """
-    Sépare le contenu d'un fichier .ics en une liste d'événements individuels
-    Chaque événement commence par BEGIN:VEVENT et se termine par END:VEVENT
-    """
-    evenements = []
-    lignes = contenu.split('\n')
-    evenement_actuel = []
-    dans_evenement = False
-    
-    for ligne in lignes:
-        ligne = ligne.strip()
-        
-        if ligne == "BEGIN:VEVENT":
-            dans_evenement = True
-            evenement_actuel = [ligne]
-        elif ligne == "END:VEVENT":
-            evenement_actuel.append(ligne)
-            evenements.append('\n'.join(evenement_actuel))
-            evenement_actuel = []
-            dans_evenement = False
-        elif dans_evenement:
-            evenement_actuel.append(ligne)
-    
-    return evenements
+import argparse
+import csv
+import gzip
+import os
+from collections import Counter
+from itertools import islice
 
+from calendrier import lire_lignes_ics, lire_evenements_ics, charger_calendrier
+from calendrier import convertir_date_ics_vers_csv, extraire_heure_ics, calculer_duree, extraire_modalite
+from calendrier import extraire_description_elements
+from differences import comparer_calendriers
 
-def extraire_propriete(contenu, identificateur):
-    """Extrait la valeur d'une propriété à partir de son identificateur"""
-    lignes = contenu.split('\n')
-    for ligne in lignes:
-        if ligne.startswith(identificateur + ':'):
-            return ligne.split(':', 1)[1].strip()
-    return "vide"
+# Colonnes du fichier CSV (en-tête)
+COLONNES_CSV = ("UID", "Date", "Heure", "Durée", "Modalité", "Intitulé", "Salles", "Professeurs", "Groupes")
 
 
-def convertir_date_ics_vers_csv(date_ics):
+class DialecteSAE(csv.Dialect):
     """
-    Convertit une date au format AAAAMMDDThhmmssZ vers JJ-MM-AAAA
-    Exemple: 20251205T090000Z -> 05-12-2025
+    Format CSV de la SAÉ : séparateur ';', fin de ligne '\n'
+    Un champ qui contient ';', '"' ou un retour à la ligne est mis entre guillemets (les '"' sont doublés)
     """
-    if not date_ics or date_ics == "vide" or len(date_ics) < 15:
-        return "vide"
-    
-    annee = date_ics[0:4]
-    mois = date_ics[4:6]
-    jour = date_ics[6:8]
-    
-    return f"{jour}-{mois}-{annee}"
+    delimiter = ';'
+    quotechar = '"'
+    doublequote = True
+    skipinitialspace = False
+    lineterminator = '\n'
+    quoting = csv.QUOTE_MINIMAL
 
 
-def extraire_heure_ics(date_ics):
-    """
-    Extrait l'heure d'une date au format AAAAMMDDThhmmssZ vers HH:MM
-    Exemple: 20251205T090000Z -> 09:00
-    """
-    if not date_ics or date_ics == "vide" or len(date_ics) < 15:
-        return "vide"
-    
-    heure = date_ics[9:11]
-    minutes = date_ics[11:13]
-    
-    return f"{heure}:{minutes}"
+csv.register_dialect('sae', DialecteSAE)
 
 
-def calculer_duree(dtstart, dtend):
+def convertir_evenement_vers_csv(evenement):
     """
-    Calcule la durée entre deux dates au format AAAAMMDDThhmmssZ
-    Retourne la durée au format HH:MM
+    Convertit un événement individuel (dictionnaire renvoyé par lire_evenements_ics) en ligne CSV
+    Retourne la liste des champs, dans l'ordre de COLONNES_CSV (l'échappement est fait par csv.writer)
     """
-    if not dtstart or not dtend or dtstart == "vide" or dtend == "vide":
-        return "vide"
-    
-    try:
-        # Extraction des heures et minutes de début
-        heure_debut = int(dtstart[9:11])
-        min_debut = int(dtstart[11:13])
-        
-        # Extraction des heures et minutes de fin
-        heure_fin = int(dtend[9:11])
-        min_fin = int(dtend[11:13])
-        
-        # Calcul de la durée en minutes
-        total_min_debut = heure_debut * 60 + min_debut
-        total_min_fin = heure_fin * 60 + min_fin
-        duree_minutes = total_min_fin - total_min_debut
-        
-        # Gestion du passage à un autre jour
-        if duree_minutes < 0:
-            duree_minutes += 24 * 60
-        
-        # Conversion en heures et minutes
-        heures = duree_minutes // 60
-        minutes = duree_minutes % 60
-        
-        return f"{heures:02d}:{minutes:02d}"
-    except:
-        return "vide"
-
-
-def extraire_modalite(summary):
-    """
-    Extrait la modalité d'enseignement du SUMMARY
-    Cherche CM, TD, TP, Proj, DS dans l'intitulé
-    """
-    if not summary or summary == "vide":
-        return "vide"
-    
-    modalites = ['CM', 'TD', 'TP', 'Proj', 'DS']
-    summary_upper = summary.upper()
-    
-    for modalite in modalites:
-        if modalite in summary_upper:
-            return modalite
-    
-    return "CM"  # Par défaut
-
-
-def extraire_description_elements(description):
-    """
-    Extrait les groupes et professeurs de la DESCRIPTION
-    Format typique: \n\nRT1-S1\nLACAN DAVID\n
-    Retourne: (liste_profs, liste_groupes)
-    """
-    if not description or description == "vide":
-        return ([], [])
-    
-    # Nettoyage de la description
-    lignes = [ligne.strip() for ligne in description.split('\\n') if ligne.strip()]
-    
-    profs = []
-    groupes = []
-    
-    for ligne in lignes:
-        # Si la ligne contient un espace et des majuscules, c'est probablement un prof
-        if ' ' in ligne and ligne.isupper():
-            profs.append(ligne)
-        # Si la ligne contient RT, TP, ou S, c'est probablement un groupe
-        elif any(prefix in ligne for prefix in ['RT', 'TP', 'S', 'A', 'B', 'C', 'D']):
-            groupes.append(ligne)
-    
-    return (profs, groupes)
-
-
-def convertir_evenement_vers_csv(contenu_evenement):
-    """
-    Convertit un événement individuel (chaîne .ics) en format pseudo-csv
-    """
-    # Extraction des propriétés
-    uid = extraire_propriete(contenu_evenement, 'UID')
-    dtstart = extraire_propriete(contenu_evenement, 'DTSTART')
-    dtend = extraire_propriete(contenu_evenement, 'DTEND')
-    summary = extraire_propriete(contenu_evenement, 'SUMMARY')
-    location = extraire_propriete(contenu_evenement, 'LOCATION')
-    description = extraire_propriete(contenu_evenement, 'DESCRIPTION')
+    # Extraction des propriétés (déjà découpées en une seule passe)
+    uid = evenement.get('UID', "vide")
+    dtstart = evenement.get('DTSTART', "vide")
+    dtend = evenement.get('DTEND', "vide")
+    summary = evenement.get('SUMMARY', "vide")
+    location = evenement.get('LOCATION', "vide")
+    description = evenement.get('DESCRIPTION', "vide")
     
     # Conversion des dates et heures
     date = convertir_date_ics_vers_csv(dtstart)
@@ -367,85 +137,152 @@ def convertir_evenement_vers_csv(contenu_evenement):
     profs_str = "|".join(profs) if profs else "vide"
     groupes_str = "|".join(groupes) if groupes else "vide"
     
-    # Construction de la chaîne pseudo-csv
-    csv_ligne = f"{uid};{date};{heure};{duree};{modalite};{intitule};{salles};{profs_str};{groupes_str}"
-    
-    return csv_ligne
+    return [uid, date, heure, duree, modalite, intitule, salles, profs_str, groupes_str]
 
 
 def convertir_ics_multiple_vers_csv(nom_fichier):
     """
     Fonction principale qui convertit un fichier .ics contenant plusieurs événements
-    en un tableau de chaînes pseudo-csv
+    en lignes CSV
+    Retourne un générateur (une liste de champs par événement, produite au fur et à mesure de la lecture)
+    ou None si le fichier ne peut pas être ouvert
     """
-    # Lecture du fichier
-    contenu = lire_fichier_ics(nom_fichier)
-    if contenu is None:
+    # Lecture du fichier ligne par ligne
+    lignes = lire_lignes_ics(nom_fichier)
+    if lignes is None:
         return None
     
-    # Extraction de tous les événements
-    evenements = extraire_evenements(contenu)
-    
-    print(f"Nombre d'événements trouvés : {len(evenements)}\n")
-    
-    # Conversion de chaque événement
-    tableau_csv = []
-    for i, evenement in enumerate(evenements):
-        csv_ligne = convertir_evenement_vers_csv(evenement)
-        tableau_csv.append(csv_ligne)
-    
-    return tableau_csv
+    # Lignes -> événements -> lignes CSV, sans tableau intermédiaire
+    return (convertir_evenement_vers_csv(evenement) for evenement in lire_evenements_ics(lignes))
 
 
-def ecrire_fichier_csv(nom_fichier_sortie, tableau_csv):
+def ecrire_fichier_csv(nom_fichier_sortie, lignes_csv, dialecte='sae', compresser=None, taille_lot=1000):
     """
-    Écrit le tableau de chaînes pseudo-csv dans un fichier CSV
+    Écrit les lignes CSV (listes de champs, en liste ou en générateur) dans un fichier CSV
     Ajoute un en-tête avec les noms des colonnes
+    dialecte : nom d'un dialecte du module csv ('sae', 'excel'...) ou classe csv.Dialect
+    compresser : écrire un fichier gzip (par défaut : si le nom se termine par .gz)
+    Les lignes sont écrites par lots de taille_lot (writerows) dans un fichier tamponné
+    Retourne le nombre d'événements écrits, ou None en cas d'erreur
     """
+    if compresser is None:
+        compresser = nom_fichier_sortie.endswith('.gz')
+    
     try:
-        with open(nom_fichier_sortie, 'w', encoding='utf-8') as f:
+        nombre = 0
+        if compresser:
+            f = gzip.open(nom_fichier_sortie, 'wt', encoding='utf-8', newline='')
+        else:
+            f = open(nom_fichier_sortie, 'w', encoding='utf-8', newline='', buffering=1 << 16)
+        with f:
+            ecrivain = csv.writer(f, dialect=dialecte)
             # Écriture de l'en-tête
-            en_tete = "UID;Date;Heure;Durée;Modalité;Intitulé;Salles;Professeurs;Groupes\n"
-            f.write(en_tete)
+            ecrivain.writerow(COLONNES_CSV)
             
-            # Écriture de chaque événement
-            for ligne in tableau_csv:
-                f.write(ligne + '\n')
+            # Écriture des événements par lots, au fil de la conversion
+            lignes_csv = iter(lignes_csv)
+            while True:
+                lot = list(islice(lignes_csv, taille_lot))
+                if not lot:
+                    break
+                ecrivain.writerows(lot)
+                nombre += len(lot)
         
-        print(f"✓ Fichier CSV créé avec succès : {len(tableau_csv)} événements")
-        return True
+        print(f"✓ Fichier CSV créé avec succès : {nombre} événements")
+        return nombre
     except Exception as e:
         print(f"✗ Erreur lors de l'écriture du fichier CSV : {e}")
-        return False
+        return None
+
+
+def mettre_a_jour_fichier_csv(nom_fichier_csv, ancien_ics, nouveau_ics, dialecte='sae'):
+    """
+    Met à jour un fichier CSV écrit depuis ancien_ics pour qu'il corresponde à nouveau_ics
+    Les séances ajoutées ou modifiées sont reconverties, les séances supprimées disparaissent ;
+    les autres lignes sont reprises du fichier existant par leur UID, dans l'ordre du nouvel export
+    (une séance sans UID, ou dont l'UID apparaît plusieurs fois, est toujours reconvertie)
+    Retourne (nombre de lignes écrites, nombre de lignes reconverties), ou None en cas d'erreur
+    """
+    ancien = charger_calendrier(ancien_ics)
+    nouveau = charger_calendrier(nouveau_ics)
+    differences = comparer_calendriers(ancien, nouveau)
+    if differences is None:
+        return None
+    a_convertir = set(differences['ajoutes']) | {numero for _, numero, _ in differences['modifies']}
+    
+    # Lignes existantes par UID (première colonne), l'en-tête est sauté
+    ouvrir = gzip.open if nom_fichier_csv.endswith('.gz') else open
+    try:
+        with ouvrir(nom_fichier_csv, 'rt', encoding='utf-8', newline='') as f:
+            lecteur = csv.reader(f, dialect=dialecte)
+            next(lecteur, None)
+            lignes_existantes = {}
+            for ligne in lecteur:
+                if ligne:
+                    lignes_existantes.setdefault(ligne[0], ligne)
+    except OSError as e:
+        print(f"✗ Erreur lors de la lecture du fichier CSV : {e}")
+        return None
+    
+    nombre_uid = Counter(evenement.get('UID') for evenement in nouveau.evenements)
+    lignes_csv = []
+    reconverties = 0
+    for numero, evenement in enumerate(nouveau.evenements):
+        uid = evenement.get('UID')
+        ligne = None
+        if numero not in a_convertir and uid and nombre_uid[uid] == 1:
+            ligne = lignes_existantes.get(uid)
+        if ligne is None:
+            ligne = convertir_evenement_vers_csv(evenement)
+            reconverties += 1
+        lignes_csv.append(ligne)
+    
+    nombre = ecrire_fichier_csv(nom_fichier_csv, lignes_csv, dialecte)
+    if nombre is None:
+        return None
+    return nombre, reconverties
 
 
 # Programme principal
 if __name__ == "__main__":
-    # Nom du fichier à traiter
-    nom_fichier = "ADE_RT1_Septembre2025_Decembre2025.ics"
-    
-    print("=== Conversion d'un fichier .ics (multiple) vers le format pseudo-csv ===\n")
+    from itertools import chain
     
-    # Conversion
-    resultat = convertir_ics_multiple_vers_csv(nom_fichier)
+    parser = argparse.ArgumentParser(description="Conversion d'un fichier .ics (multiple) vers le format csv")
+    parser.add_argument('--depuis', metavar='ANCIEN_ICS', default=None,
+                        help="mettre à jour le fichier CSV déjà écrit depuis cet export précédent "
+                             "(seules les séances changées sont reconverties)")
+    arguments = parser.parse_args()
     
-    if resultat:
-        print("Résultat de la conversion :")
-        print(f"Tableau contenant {len(resultat)} événements\n")
-        
-        # Affichage des 5 premiers événements comme exemple
-        print("Exemple des 5 premiers événements :")
-        for i, ligne in enumerate(resultat[:5]):
-            print(f"\nÉvénement {i+1}:")
-            print(ligne)
-        
-        if len(resultat) > 5:
-            print(f"\n... et {len(resultat) - 5} autres événements")
-        
-        # Écriture dans un fichier CSV
-        print("\n--- Écriture dans un fichier CSV ---")
-        nom_fichier_sortie = "calendrier_output.csv"
-        ecrire_fichier_csv(nom_fichier_sortie, resultat)
-        print(f"Résultat écrit dans '{nom_fichier_sortie}'")
+    # Nom du fichier à traiter
+    nom_fichier = "ADE_RT1_Septembre2025_Decembre2025.ics"
+    nom_fichier_sortie = "calendrier_output.csv"
+    
+    print("=== Conversion d'un fichier .ics (multiple) vers le format csv ===\n")
+    
+    if arguments.depuis is not None and os.path.exists(nom_fichier_sortie):
+        print(f"--- Mise à jour de '{nom_fichier_sortie}' depuis {arguments.depuis} ---")
+        mise_a_jour = mettre_a_jour_fichier_csv(nom_fichier_sortie, arguments.depuis, nom_fichier)
+        if mise_a_jour is not None:
+            nombre, reconverties = mise_a_jour
+            print(f"Résultat de la mise à jour : {nombre} événements, dont {reconverties} reconverti(s)")
+        else:
+            print("La mise à jour a échoué.")
     else:
-        print("La conversion a échoué.")
+        # Conversion (générateur : rien n'est encore lu)
+        resultat = convertir_ics_multiple_vers_csv(nom_fichier)
+        
+        if resultat is not None:
+            # Affichage des 5 premiers événements comme exemple
+            premiers = list(islice(resultat, 5))
+            print("Exemple des 5 premiers événements :")
+            for i, ligne in enumerate(premiers):
+                print(f"\nÉvénement {i+1}:")
+                print(";".join(ligne))
+            
+            # Écriture dans un fichier CSV : les 5 premiers puis le reste, au fil de la lecture
+            print("\n--- Écriture dans un fichier CSV ---")
+            nombre = ecrire_fichier_csv(nom_fichier_sortie, chain(premiers, resultat))
+            if nombre is not None:
+                print(f"Résultat de la conversion : {nombre} événements écrits dans '{nom_fichier_sortie}'")
+        else:
+            print("La conversion a échoué.")
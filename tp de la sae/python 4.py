@@ -11,303 +11,92 @@ INSTALLATION REQUISE :
 
 import markdown
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import argparse
 import os
 import base64
 
-def lire_fichier_ics(nom_fichier):
-    """Lit le contenu d'un fichier .ics"""
-    try:
-        with open(nom_fichier, 'r', encoding='utf-8') as fichier:
-            contenu = fichier.read()
-        return contenu
-    except FileNotFoundError:
-        print(f"Erreur : Le fichier {nom_fichier} n'a pas été trouvé.")
-        return None
-    except Exception as e:
-        print(f"Erreur lors de la lecture du fichier : {e}")
-        return None
-
-
-def extraire_evenements(contenu):
-    """Sépare le contenu d'un fichier .ics en une liste d'événements individuels"""
-    evenements = []
-    lignes = contenu.split('\n')
-    evenement_actuel = []
-    dans_evenement = False
-    
-    for ligne in lignes:
-        ligne = ligne.strip()
-        
-        if ligne == "BEGIN:VEVENT":
-            dans_evenement = True
-            evenement_actuel = [ligne]
-        elif ligne == "END:VEVENT":
-            evenement_actuel.append(ligne)
-            evenements.append('\n'.join(evenement_actuel))
-            evenement_actuel = []
-            dans_evenement = False
-        elif dans_evenement:
-            evenement_actuel.append(ligne)
-    
-    return evenements
-
-
-def extraire_propriete(contenu, identificateur):
-    """Extrait la valeur d'une propriété à partir de son identificateur"""
-    lignes = contenu.split('\n')
-    for ligne in lignes:
-        if ligne.startswith(identificateur + ':'):
-            return ligne.split(':', 1)[1].strip()
-    return "vide"
-
-
-def convertir_date_ics_vers_csv(date_ics):
-    """Convertit une date au format AAAAMMDDThhmmssZ vers JJ-MM-AAAA"""
-    if not date_ics or date_ics == "vide" or len(date_ics) < 15:
-        return "vide"
-    
-    annee = date_ics[0:4]
-    mois = date_ics[4:6]
-    jour = date_ics[6:8]
-    
-    return f"{jour}-{mois}-{annee}"
-
-
-def calculer_duree(dtstart, dtend):
-    """Calcule la durée entre deux dates"""
-    if not dtstart or not dtend or dtstart == "vide" or dtend == "vide":
-        return "vide"
-    
-    try:
-        heure_debut = int(dtstart[9:11])
-        min_debut = int(dtstart[11:13])
-        heure_fin = int(dtend[9:11])
-        min_fin = int(dtend[11:13])
-        
-        total_min_debut = heure_debut * 60 + min_debut
-        total_min_fin = heure_fin * 60 + min_fin
-        duree_minutes = total_min_fin - total_min_debut
-        
-        if duree_minutes < 0:
-            duree_minutes += 24 * 60
-        
-        heures = duree_minutes // 60
-        minutes = duree_minutes % 60
-        
-        return f"{heures:02d}:{minutes:02d}"
-    except:
-        return "vide"
-
-
-def extraire_mois_de_date(date_str):
-    """Extrait le mois d'une date au format JJ-MM-AAAA"""
-    if not date_str or date_str == "vide":
-        return None
-    
-    mois_dict = {
-        '01': 'Janvier', '02': 'Février', '03': 'Mars', '04': 'Avril',
-        '05': 'Mai', '06': 'Juin', '07': 'Juillet', '08': 'Août',
-        '09': 'Septembre', '10': 'Octobre', '11': 'Novembre', '12': 'Décembre'
-    }
-    
-    parties = date_str.split('-')
-    if len(parties) >= 2:
-        return mois_dict.get(parties[1], None)
-    
-    return None
-
-
-def extraire_modalite(summary):
-    """Extrait la modalité d'enseignement du SUMMARY"""
-    if not summary or summary == "vide":
-        return "vide"
-    
-    modalites = ['CM', 'TD', 'TP', 'Proj', 'DS']
-    summary_upper = summary.upper()
-    
-    for modalite in modalites:
-        if modalite in summary_upper:
-            return modalite
-    
-    return "vide"
-
-
-def extraire_groupes(description):
-    """Extrait la liste des groupes de la DESCRIPTION"""
-    if not description or description == "vide":
+from calendrier import Calendrier, charger_calendrier, convertir_date_ics_vers_csv, calculer_duree
+from calendrier import extraire_mois_de_date, extraire_modalite, modalite_des_groupes, texte_groupe
+from statistiques import numpy_disponible, compter_seances_par_mois
+from graphique import Graphique, ordre_mois
+from occupation import detecter_conflits, conflits_du_groupe, decrire_conflit
+from differences import comparer_calendriers, groupes_touches
+
+
+def obtenir_seances_ressource(source, groupe_tp, ressource='R1.07'):
+    """
+    Obtient toutes les séances d'une ressource (ex: R1.07, SAE1.02) pour un groupe
+    source : nom du fichier .ics ou Calendrier déjà lu (module calendrier.py)
+    """
+    calendrier = charger_calendrier(source)
+    if calendrier is None:
         return []
     
-    lignes = []
-    for sep in ['\\n', '\n', '\\r\\n']:
-        if sep in description:
-            lignes = [ligne.strip() for ligne in description.split(sep) if ligne.strip()]
-            break
-    
-    if not lignes:
-        lignes = [description.strip()]
-    
-    groupes = []
-    
-    for ligne in lignes:
-        ligne_upper = ligne.upper()
-        if 'RT' in ligne_upper or 'TP' in ligne_upper or any(f'-{lettre}' in ligne_upper or f'{lettre}1' in ligne_upper or f'{lettre}2' in ligne_upper for lettre in ['A', 'B', 'C', 'D']):
-            groupes.append(ligne)
-        elif ligne_upper.startswith('S') and len(ligne) <= 3:
-            groupes.append(ligne)
-    
-    return groupes
-
-
-def appartient_au_groupe(groupes_evenement, groupe_recherche):
-    """Vérifie si le groupe recherché fait partie des groupes de l'événement"""
-    if not groupes_evenement:
-        return False
-    
-    groupe_recherche_clean = groupe_recherche.upper().strip()
-    composants_recherche = [groupe_recherche_clean]
-    
-    if '-' in groupe_recherche_clean:
-        parties = groupe_recherche_clean.split('-')
-        composants_recherche.extend(parties)
+    seances = []
     
-    for groupe in groupes_evenement:
-        groupe_clean = groupe.upper().strip()
-        
-        if groupe_clean == groupe_recherche_clean:
-            return True
+    for evenement in calendrier.rechercher(groupe=groupe_tp, ressource=ressource):
+        summary = evenement.get('SUMMARY', "vide")
+        dtstart = evenement.get('DTSTART', "vide")
+        dtend = evenement.get('DTEND', "vide")
         
-        for composant in composants_recherche:
-            if composant in groupe_clean:
-                return True
+        date = convertir_date_ics_vers_csv(dtstart)
+        duree = calculer_duree(dtstart, dtend)
+        modalite = extraire_modalite(summary, "vide")
         
-        if groupe_clean in groupe_recherche_clean:
-            return True
+        seances.append({
+            'date': date,
+            'duree': duree,
+            'modalite': modalite
+        })
     
-    return False
-
-
-def est_ressource_r107(summary):
-    """Vérifie si l'intitulé correspond à la ressource R1.07"""
-    if not summary or summary == "vide":
-        return False
-    
-    summary_upper = summary.upper()
-    variantes = ['R1.07', 'R107', 'R1-07', 'R 1.07']
-    
-    for variante in variantes:
-        if variante in summary_upper:
-            return True
-    
-    return False
+    return seances
 
 
-def obtenir_seances_r107(nom_fichier, groupe_tp):
+def obtenir_seances_r107(source, groupe_tp):
     """Obtient toutes les séances de R1.07 pour un groupe"""
-    contenu = lire_fichier_ics(nom_fichier)
-    if contenu is None:
-        return []
-    
-    evenements = extraire_evenements(contenu)
-    seances = []
-    
-    for evenement in evenements:
-        summary = extraire_propriete(evenement, 'SUMMARY')
-        description = extraire_propriete(evenement, 'DESCRIPTION')
-        
-        if est_ressource_r107(summary):
-            groupes = extraire_groupes(description)
-            
-            if appartient_au_groupe(groupes, groupe_tp):
-                dtstart = extraire_propriete(evenement, 'DTSTART')
-                dtend = extraire_propriete(evenement, 'DTEND')
-                
-                date = convertir_date_ics_vers_csv(dtstart)
-                duree = calculer_duree(dtstart, dtend)
-                modalite = extraire_modalite(summary)
-                
-                seances.append({
-                    'date': date,
-                    'duree': duree,
-                    'modalite': modalite
-                })
-    
-    return seances
+    return obtenir_seances_ressource(source, groupe_tp, 'R1.07')
 
 
-def compter_tp_par_mois(nom_fichier, groupe_tp):
-    """Compte le nombre de séances de TP par mois"""
-    contenu = lire_fichier_ics(nom_fichier)
-    if contenu is None:
+def compter_tp_par_mois(source, groupe_tp):
+    """
+    Compte le nombre de séances de TP par mois
+    source : nom du fichier .ics ou Calendrier déjà lu (module calendrier.py)
+    """
+    calendrier = charger_calendrier(source)
+    if calendrier is None:
         return {}
     
-    evenements = extraire_evenements(contenu)
+    # Avec NumPy, le comptage est un regroupement vectorisé sur les tableaux du calendrier (statistiques.py)
+    if numpy_disponible():
+        return compter_seances_par_mois(calendrier, groupe_tp, 'TP')
+    
     mois_list = []
     
-    for evenement in evenements:
-        summary = extraire_propriete(evenement, 'SUMMARY')
-        description = extraire_propriete(evenement, 'DESCRIPTION')
-        modalite = extraire_modalite(summary)
+    # Même règle que statistiques.py et charge.py : sans modalité dans l'intitulé, le groupe la donne
+    for numero in calendrier.numeros(groupe=groupe_tp):
+        evenement = calendrier.evenements[numero]
+        if modalite_des_groupes(evenement.get('SUMMARY', "vide"), calendrier.groupes[numero]) != 'TP':
+            continue
+        dtstart = evenement.get('DTSTART', "vide")
+        date = convertir_date_ics_vers_csv(dtstart)
+        mois = extraire_mois_de_date(date)
         
-        if modalite == 'TP':
-            groupes = extraire_groupes(description)
-            
-            if appartient_au_groupe(groupes, groupe_tp):
-                dtstart = extraire_propriete(evenement, 'DTSTART')
-                date = convertir_date_ics_vers_csv(dtstart)
-                mois = extraire_mois_de_date(date)
-                
-                if mois:
-                    mois_list.append(mois)
+        if mois:
+            mois_list.append(mois)
     
     return Counter(mois_list)
 
 
 def generer_graphique_base64(compteur_mois):
-    """Génère un graphique SVG et le convertit en base64"""
+    """Génère un graphique SVG (moteur de graphiques commun graphique.py) et le convertit en base64"""
     
-    mois_ordre = ['Septembre', 'Octobre', 'Novembre', 'Décembre']
+    mois_ordre = ordre_mois(compteur_mois)
     valeurs = [compteur_mois.get(mois, 0) for mois in mois_ordre]
-    couleurs = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
-    
-    max_valeur = max(valeurs) if max(valeurs) > 0 else 5
-    echelle_max = max_valeur + 2
-    
-    svg = '<svg width="900" height="500" xmlns="http://www.w3.org/2000/svg">'
-    svg += '<rect width="900" height="500" fill="white"/>'
-    
-    # Grille
-    for i in range(0, int(echelle_max) + 1):
-        y = 400 - (i * 300 / echelle_max)
-        svg += f'<line x1="100" y1="{y}" x2="850" y2="{y}" stroke="#e0e0e0" stroke-width="1"/>'
-        svg += f'<text x="80" y="{y + 5}" text-anchor="end" font-size="14">{i}</text>'
-    
-    # Axes
-    svg += '<line x1="100" y1="50" x2="100" y2="400" stroke="black" stroke-width="2"/>'
-    svg += '<line x1="100" y1="400" x2="850" y2="400" stroke="black" stroke-width="2"/>'
-    svg += '<text x="50" y="230" font-size="16" font-weight="bold" transform="rotate(-90 50 230)">Nombre de TP</text>'
-    svg += '<text x="450" y="470" font-size="16" font-weight="bold" text-anchor="middle">Mois</text>'
-    
-    # Barres
-    largeur_barre = 120
-    espace = 180
-    x_start = 150
-    
-    for i, (mois, valeur, couleur) in enumerate(zip(mois_ordre, valeurs, couleurs)):
-        x = x_start + i * espace
-        if echelle_max > 0:
-            hauteur = (valeur * 300) / echelle_max
-        else:
-            hauteur = 0
-        y = 400 - hauteur
-        
-        svg += f'<rect x="{x}" y="{y}" width="{largeur_barre}" height="{hauteur}" '
-        svg += f'fill="{couleur}" stroke="black" stroke-width="2"/>'
-        svg += f'<text x="{x + largeur_barre/2}" y="{y - 10}" text-anchor="middle" '
-        svg += f'font-size="18" font-weight="bold">{int(valeur)}</text>'
-        svg += f'<text x="{x + largeur_barre/2}" y="430" text-anchor="middle" '
-        svg += f'font-size="14">{mois}</text>'
     
-    svg += '</svg>'
+    graphique = Graphique(mois_ordre, valeurs, 900, 500, marges=(100, 50, 100, 100),
+                          titre_x="Mois", titre_y="Nombre de TP")
+    svg = graphique.vers_svg()
     
     # Convertir en base64
     svg_bytes = svg.encode('utf-8')
@@ -316,8 +105,48 @@ def generer_graphique_base64(compteur_mois):
     return f"data:image/svg+xml;base64,{svg_base64}"
 
 
-def generer_contenu_markdown(groupe_tp, seances_r107, compteur_mois):
-    """Génère le contenu en Markdown pour le rapport"""
+def obtenir_conflits_groupe(source, groupe_tp, conflits=None):
+    """
+    Conflits d'emploi du temps (salle, professeur ou groupe réservé deux fois) qui touchent un groupe
+    conflits : résultat de detecter_conflits() déjà calculé (sinon il est calculé ici)
+    Retourne une liste de dicts {'date', 'horaire', 'type', 'concerne', 'seance_a', 'seance_b'}
+    """
+    calendrier = charger_calendrier(source)
+    if calendrier is None:
+        return []
+    if conflits is None:
+        conflits = detecter_conflits(calendrier)
+    return [decrire_conflit(calendrier, conflit) for conflit in conflits_du_groupe(calendrier, conflits, groupe_tp)]
+
+
+# Intitulés des ressources affichés dans le rapport (le code seul est affiché pour les autres)
+NOMS_RESSOURCES = {'R1.07': 'Informatique'}
+
+
+def decrire_periode(calendrier):
+    """Période couverte par le calendrier, ex: 'septembre-décembre 2025' ou 'septembre 2025-janvier 2026'"""
+    debuts = [debut for debut in calendrier.debuts if debut is not None]
+    if not debuts:
+        return "période inconnue"
+    premier, dernier = min(debuts), max(debuts)
+    mois_premier = extraire_mois_de_date(premier.strftime("%d-%m-%Y")).lower()
+    mois_dernier = extraire_mois_de_date(dernier.strftime("%d-%m-%Y")).lower()
+    if premier.year != dernier.year:
+        return f"{mois_premier} {premier.year}-{mois_dernier} {dernier.year}"
+    if premier.month != dernier.month:
+        return f"{mois_premier}-{mois_dernier} {dernier.year}"
+    return f"{mois_dernier} {dernier.year}"
+
+
+def generer_contenu_markdown(groupe_tp, seances_r107, compteur_mois, ressource='R1.07', conflits=None,
+                             fichier_source="", periode=""):
+    """
+    Génère le contenu en Markdown pour le rapport (séances de la ressource + graphique des TP)
+    conflits : liste de obtenir_conflits_groupe() ; la section des conflits est omise si None
+    fichier_source, periode : fichier .ics analysé et période qu'il couvre (voir decrire_periode)
+    """
+    
+    nom_ressource = f"{ressource} ({NOMS_RESSOURCES[ressource]})" if ressource in NOMS_RESSOURCES else ressource
     
     markdown_content = f"""# Rapport d'Analyse - SAÉ 1.5
 ## Traiter des Données avec Python
@@ -328,13 +157,13 @@ def generer_contenu_markdown(groupe_tp, seances_r107, compteur_mois):
 
 - **Groupe de TP** : {groupe_tp}
 - **Date de génération** : {obtenir_date_actuelle()}
-- **Fichier source** : ADE_RT1_Septembre2025_Decembre2025.ics
+- **Fichier source** : {fichier_source}
 
 ---
 
-## Travail 3 : Tableau des séances de R1.07
+## Travail 3 : Tableau des séances de {ressource}
 
-Cette section présente toutes les séances de la ressource **R1.07 (Informatique)** pour le groupe **{groupe_tp}**.
+Cette section présente toutes les séances de la ressource **{nom_ressource}** pour le groupe **{groupe_tp}**.
 
 ### Résultats
 
@@ -353,10 +182,10 @@ Cette section présente toutes les séances de la ressource **R1.07 (Informatiqu
     markdown_content += "\n---\n\n"
     markdown_content += "## Travail 4 : Graphique du nombre de séances de TP par mois\n\n"
     markdown_content += "Ce graphique présente le nombre de séances de **TP** (tous modules confondus) pour le groupe "
-    markdown_content += f"**{groupe_tp}** sur la période septembre-décembre 2025.\n\n"
+    markdown_content += f"**{groupe_tp}** sur la période {periode}.\n\n"
     
     # Statistiques
-    mois_ordre = ['Septembre', 'Octobre', 'Novembre', 'Décembre']
+    mois_ordre = ordre_mois(compteur_mois)
     total_tp = sum(compteur_mois.get(mois, 0) for mois in mois_ordre)
     
     markdown_content += "### Statistiques\n\n"
@@ -377,6 +206,24 @@ Cette section présente toutes les séances de la ressource **R1.07 (Informatiqu
     markdown_content += f'<img src="{graphique_base64}" alt="Graphique des séances de TP" style="max-width: 100%; border: 1px solid #ddd; border-radius: 5px; padding: 10px; background: white;"/>\n\n'
     
     markdown_content += "---\n\n"
+    
+    if conflits is not None:
+        markdown_content += "## Conflits d'emploi du temps\n\n"
+        markdown_content += "Salles, professeurs ou groupes réservés sur deux séances en même temps "
+        markdown_content += f"(séances qui concernent le groupe **{groupe_tp}**).\n\n"
+        
+        if conflits:
+            markdown_content += f"Nombre de conflits : **{len(conflits)}**\n\n"
+            markdown_content += "| Date | Horaire | Type | Concerné | Séance 1 | Séance 2 |\n"
+            markdown_content += "|------|---------|------|----------|----------|----------|\n"
+            for conflit in conflits:
+                markdown_content += (f"| {conflit['date']} | {conflit['horaire']} | {conflit['type']} | "
+                                     f"{conflit['concerne']} | {conflit['seance_a']} | {conflit['seance_b']} |\n")
+        else:
+            markdown_content += "*Aucun conflit détecté.*\n"
+        
+        markdown_content += "\n---\n\n"
+    
     markdown_content += "## Analyse\n\n"
     
     # Ajouter une petite analyse
@@ -387,7 +234,7 @@ Cette section présente toutes les séances de la ressource **R1.07 (Informatiqu
     markdown_content += f"- Le groupe **{groupe_tp}** a eu au total **{total_tp}** séances de TP sur la période.\n"
     
     if len(seances_r107) > 0:
-        markdown_content += f"- Le groupe a également suivi **{len(seances_r107)}** séance(s) de R1.07 (Informatique).\n"
+        markdown_content += f"- Le groupe a également suivi **{len(seances_r107)}** séance(s) de {nom_ressource}.\n"
     
     markdown_content += "\n---\n\n"
     markdown_content += "*Rapport généré automatiquement par Programme5.py*\n"
@@ -557,26 +404,45 @@ def generer_rapport_html(nom_fichier_ics, groupe_tp, nom_fichier_html):
     print(f"Groupe analysé : {groupe_tp}")
     print(f"Fichier source : {nom_fichier_ics}\n")
     
+    print("-" * 70)
+    print("Étape 0 : Lecture du calendrier")
+    print("-" * 70)
+    
+    # Le fichier est lu et découpé une seule fois, puis partagé par les étapes 1 et 2
+    calendrier = Calendrier.depuis_fichier(nom_fichier_ics)
+    if calendrier is None:
+        return False
+    print(f"✓ {len(calendrier)} événement(s) lu(s)\n")
+    
     print("-" * 70)
     print("Étape 1 : Extraction des séances R1.07")
     print("-" * 70)
     
-    seances_r107 = obtenir_seances_r107(nom_fichier_ics, groupe_tp)
+    seances_r107 = obtenir_seances_r107(calendrier, groupe_tp)
     print(f"✓ {len(seances_r107)} séance(s) de R1.07 trouvée(s)\n")
     
     print("-" * 70)
     print("Étape 2 : Comptage des TP par mois")
     print("-" * 70)
     
-    compteur_mois = compter_tp_par_mois(nom_fichier_ics, groupe_tp)
+    compteur_mois = compter_tp_par_mois(calendrier, groupe_tp)
     total_tp = sum(compteur_mois.values())
     print(f"✓ {total_tp} séance(s) de TP trouvée(s) au total\n")
     
+    print("-" * 70)
+    print("Étape 2 bis : Détection des conflits (salles, professeurs, groupes)")
+    print("-" * 70)
+    
+    conflits = obtenir_conflits_groupe(calendrier, groupe_tp)
+    print(f"✓ {len(conflits)} conflit(s) concernant le groupe\n")
+    
     print("-" * 70)
     print("Étape 3 : Génération du contenu Markdown")
     print("-" * 70)
     
-    contenu_markdown = generer_contenu_markdown(groupe_tp, seances_r107, compteur_mois)
+    contenu_markdown = generer_contenu_markdown(groupe_tp, seances_r107, compteur_mois, conflits=conflits,
+                                                fichier_source=os.path.basename(nom_fichier_ics),
+                                                periode=decrire_periode(calendrier))
     print("✓ Contenu Markdown généré\n")
     
     print("-" * 70)
@@ -620,17 +486,148 @@ def generer_rapport_html(nom_fichier_ics, groupe_tp, nom_fichier_html):
         return False
 
 
+def decouvrir_groupes_tp(calendrier):
+    """
+    Retrouve tous les groupes de TP cités dans les DESCRIPTION du calendrier
+    Exemple: ('RT1', 'TP', 'A', 1, '') -> 'RT1-A1' (même format que le groupe saisi habituellement)
+    Un groupe de TP sans numéro ou avec suffixe garde son étiquette complète : ('RT3', 'TP', 'C', 0, 'FI') -> 'RT3-TP_C_FI'
+    """
+    groupes = []
+    for cle in calendrier.valeurs('groupe'):
+        promotion, type_groupe, lettre, numero, suffixe = cle
+        if type_groupe != 'TP':
+            continue
+        if numero and not suffixe:
+            groupes.append(f"{promotion}-{lettre}{numero}")
+        else:
+            groupes.append(texte_groupe(cle))
+    return groupes
+
+
+# Calendrier de chaque processus du lot (relu depuis le cache, donc sans nouvelle analyse du .ics)
+CALENDRIER_LOT = None
+# Conflits de ce calendrier, détectés une fois par processus et filtrés ensuite pour chaque groupe
+CONFLITS_LOT = None
+
+
+def initialiser_processus_lot(nom_fichier_ics):
+    """Chargé une fois par processus : relit le calendrier depuis son cache"""
+    global CALENDRIER_LOT, CONFLITS_LOT
+    CALENDRIER_LOT = Calendrier.depuis_fichier(nom_fichier_ics)
+    if CALENDRIER_LOT is not None:
+        CONFLITS_LOT = detecter_conflits(CALENDRIER_LOT)
+
+
+def generer_rapport_lot(travail):
+    """
+    Génère un rapport (sans affichage ni ouverture du navigateur) pour un couple (groupe, ressource)
+    Retourne (nom du fichier HTML, nombre de séances de la ressource), ou (nom, None) si le calendrier
+    n'a pas pu être relu par ce processus
+    """
+    groupe_tp, ressource, nom_fichier_html = travail
+    if CALENDRIER_LOT is None:
+        return nom_fichier_html, None
+    
+    seances = obtenir_seances_ressource(CALENDRIER_LOT, groupe_tp, ressource)
+    compteur_mois = compter_tp_par_mois(CALENDRIER_LOT, groupe_tp)
+    conflits = obtenir_conflits_groupe(CALENDRIER_LOT, groupe_tp, CONFLITS_LOT)
+    contenu_markdown = generer_contenu_markdown(groupe_tp, seances, compteur_mois, ressource, conflits,
+                                                os.path.basename(CALENDRIER_LOT.nom_fichier),
+                                                decrire_periode(CALENDRIER_LOT))
+    contenu_html = markdown.Markdown(extensions=['tables', 'extra']).convert(contenu_markdown)
+    
+    with open(nom_fichier_html, 'w', encoding='utf-8') as f:
+        f.write(generer_html_avec_style(contenu_html))
+    
+    return nom_fichier_html, len(seances)
+
+
+def generer_rapports_lot(nom_fichier_ics, dossier_sortie="rapports", nb_processus=None, ancien_ics=None):
+    """
+    Génère les rapports de tous les groupes de TP pour chaque ressource qu'ils suivent
+    (les couples groupe × ressource sans aucune séance sont ignorés)
+    Le fichier .ics est analysé une seule fois (le cache est ensuite relu par chaque processus)
+    et les rapports sont produits en parallèle
+    ancien_ics : export précédent ; seuls les rapports des groupes touchés par les changements
+    (et les rapports absents du dossier) sont alors régénérés
+    """
+    print("="*70)
+    print("  PROGRAMME 5 - GÉNÉRATION DE TOUS LES RAPPORTS")
+    print("="*70)
+    print()
+    
+    calendrier = Calendrier.depuis_fichier(nom_fichier_ics)
+    if calendrier is None:
+        return False
+    
+    groupes = decouvrir_groupes_tp(calendrier)
+    ressources = calendrier.valeurs('ressource')
+    print(f"✓ {len(calendrier)} événement(s), {len(groupes)} groupe(s) de TP, {len(ressources)} ressource(s)\n")
+    
+    groupes_a_regenerer = set(groupes)
+    if ancien_ics is not None:
+        differences = comparer_calendriers(ancien_ics, calendrier)
+        if differences is not None:
+            groupes_a_regenerer = groupes_touches(ancien_ics, calendrier, groupes, differences)
+            print(f"✓ Depuis {ancien_ics} : {len(differences['ajoutes'])} ajout(s), "
+                  f"{len(differences['supprimes'])} suppression(s), {len(differences['modifies'])} modification(s), "
+                  f"{len(groupes_a_regenerer)} groupe(s) touché(s)\n")
+    
+    os.makedirs(dossier_sortie, exist_ok=True)
+    travaux = []
+    nb_rapports = 0
+    for groupe_tp in groupes:
+        for ressource in ressources:
+            if not calendrier.numeros(groupe=groupe_tp, ressource=ressource):
+                continue
+            nb_rapports += 1
+            nom_fichier_html = f"rapport_SAE15_{groupe_tp.replace('-', '_')}_{ressource.replace('.', '_')}.html"
+            chemin = os.path.join(dossier_sortie, nom_fichier_html)
+            if groupe_tp in groupes_a_regenerer or not os.path.exists(chemin):
+                travaux.append((groupe_tp, ressource, chemin))
+    
+    echecs = 0
+    with ProcessPoolExecutor(max_workers=nb_processus, initializer=initialiser_processus_lot,
+                             initargs=(nom_fichier_ics,)) as executeur:
+        for nom_fichier_html, nb_seances in executeur.map(generer_rapport_lot, travaux, chunksize=8):
+            if nb_seances is None:
+                echecs += 1
+                print(f"✗ {nom_fichier_html} (calendrier illisible)")
+            else:
+                print(f"✓ {nom_fichier_html} ({nb_seances} séance(s))")
+    
+    print(f"\n✓ {len(travaux) - echecs} rapport(s) généré(s) dans '{dossier_sortie}'")
+    if len(travaux) < nb_rapports:
+        print(f"✓ {nb_rapports - len(travaux)} rapport(s) inchangé(s) conservé(s)")
+    return echecs == 0
+
+
 # Programme principal
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génération des rapports HTML de la SAÉ 1.5")
+    parser.add_argument('--tous', action='store_true',
+                        help="générer les rapports de tous les groupes de TP pour toutes les ressources")
+    parser.add_argument('--processus', type=int, default=None,
+                        help="nombre de processus pour --tous (par défaut : nombre de cœurs)")
+    parser.add_argument('--depuis', metavar='ANCIEN_ICS', default=None,
+                        help="avec --tous : ne régénérer que les rapports touchés depuis cet export précédent")
+    arguments = parser.parse_args()
+    
     # Configuration
     nom_fichier_ics = "ADE_RT1_Septembre2025_Decembre2025.ics"
-    groupe_tp = "RT1-A1"
-    nom_fichier_html = f"rapport_SAE15_{groupe_tp.replace('-', '_')}.html"
-    
-    # Générer le rapport
-    succes = generer_rapport_html(nom_fichier_ics, groupe_tp, nom_fichier_html)
     
-    if succes:
-        print(f"\n✓ Vous pouvez consulter le rapport : {nom_fichier_html}")
+    if arguments.tous:
+        succes = generer_rapports_lot(nom_fichier_ics, nb_processus=arguments.processus, ancien_ics=arguments.depuis)
+        if not succes:
+            print("\n✗ La génération des rapports a échoué.")
     else:
-        print("\n✗ La génération du rapport a échoué.")
+        groupe_tp = "RT1-A1"
+        nom_fichier_html = f"rapport_SAE15_{groupe_tp.replace('-', '_')}.html"
+        
+        # Générer le rapport
+        succes = generer_rapport_html(nom_fichier_ics, groupe_tp, nom_fichier_html)
+        
+        if succes:
+            print(f"\n✓ Vous pouvez consulter le rapport : {nom_fichier_html}")
+        else:
+            print("\n✗ La génération du rapport a échoué.")
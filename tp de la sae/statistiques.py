@@ -0,0 +1,199 @@
+"""
+statistiques.py
+Statistiques vectorisées d'un Calendrier (module calendrier.py) avec NumPy
+Le calendrier est converti une seule fois en tableaux : début et fin (datetime64, heure de Paris), durées en heures,
+codes de catégorie pour la ressource, la modalité, les groupes, les salles et les professeurs
+Chaque regroupement (heures par mois, par semaine, par professeur, par salle...) est ensuite un np.bincount
+
+NumPy est optionnel : sans lui, les programmes gardent leur calcul événement par événement
+Pour l'installer :
+    python -m pip install numpy
+"""
+
+from collections import Counter
+
+from calendrier import CODES_RESSOURCES, charger_calendrier, modalite_des_groupes, extraire_mois_de_date
+from calendrier import extraire_professeurs, extraire_salles, texte_groupe
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def numpy_disponible():
+    """Indique si NumPy est installé (sinon les statistiques vectorisées ne sont pas utilisables)"""
+    return np is not None
+
+
+def encoder_categories(valeurs):
+    """
+    Encode une liste de textes en codes entiers
+    Retourne (etiquettes triées, codes) avec etiquettes[codes[i]] == valeurs[i]
+    """
+    etiquettes, codes = np.unique(np.array(valeurs, dtype=str), return_inverse=True)
+    return etiquettes.tolist(), codes.astype(np.int32)
+
+
+class TableauxCalendrier:
+    """
+    Vue en colonnes NumPy d'un Calendrier (une case par événement, dans l'ordre du fichier)
+    - debut, fin : datetime64[m] à l'heure de Paris (NaT si la date est absente) ; duree : heures (0 si inconnue)
+    - ressource, modalite : codes entiers, étiquettes dans categories['ressource'] / categories['modalite']
+    - groupe, salle, professeur : plusieurs valeurs par événement, rangées en liens (numéros, codes)
+    """
+
+    def __init__(self, calendrier):
+        self.calendrier = calendrier
+        self.categories = {}
+        self.liens = {}
+
+        debuts, durees, ressources, modalites = [], [], [], []
+        liens_texte = {'groupe': ([], []), 'salle': ([], []), 'professeur': ([], [])}
+        numeros_groupe, groupes = liens_texte['groupe']
+        numeros_salle, salles = liens_texte['salle']
+        numeros_professeur, professeurs = liens_texte['professeur']
+
+        # Un seul parcours en Python pur ; tout le reste est calculé sur les tableaux
+        # Les dates sont celles du calendrier, déjà converties à l'heure de Paris
+        # Les codes de ressource sont ceux déjà internés par le calendrier (calendrier.ressources)
+        for numero, (evenement, groupes_evenement, debut, fin, ressource) in enumerate(
+                zip(calendrier.evenements, calendrier.groupes, calendrier.debuts, calendrier.fins, calendrier.ressources)):
+            summary = evenement.get('SUMMARY', "vide")
+            # datetime64 ne gère pas les fuseaux : on garde l'heure locale, la durée est calculée avant
+            debuts.append(debut.replace(tzinfo=None) if debut is not None else None)
+            durees.append((fin - debut).total_seconds() / 3600 if debut is not None and fin is not None else 0.0)
+            ressources.append(CODES_RESSOURCES[ressource])
+            modalites.append(modalite_des_groupes(summary, groupes_evenement))
+            for groupe in groupes_evenement:
+                numeros_groupe.append(numero)
+                groupes.append(texte_groupe(groupe))
+            for salle in extraire_salles(evenement.get('LOCATION', "vide")):
+                numeros_salle.append(numero)
+                salles.append(salle)
+            for professeur in extraire_professeurs(evenement.get('DESCRIPTION', "vide")):
+                numeros_professeur.append(numero)
+                professeurs.append(professeur)
+
+        self.debut = np.array(debuts, dtype='datetime64[m]')
+        self.duree = np.array(durees, dtype=np.float64)
+        self.fin = self.debut + np.round(self.duree * 60).astype('timedelta64[m]')
+
+        self.categories['ressource'], self.ressource = encoder_categories(ressources)
+        self.categories['modalite'], self.modalite = encoder_categories(modalites)
+        for dimension, (numeros, valeurs) in liens_texte.items():
+            self.categories[dimension], codes = encoder_categories(valeurs)
+            self.liens[dimension] = (np.array(numeros, dtype=np.int64), codes)
+
+    @classmethod
+    def depuis(cls, source):
+        """
+        Retourne les tableaux d'un Calendrier (ou d'un nom de fichier .ics), construits une seule fois
+        puis gardés dans calendrier.tableaux ; None si le fichier est illisible
+        """
+        calendrier = charger_calendrier(source)
+        if calendrier is None:
+            return None
+        if calendrier.tableaux is None:
+            calendrier.tableaux = cls(calendrier)
+        return calendrier.tableaux
+
+    def __len__(self):
+        return len(self.debut)
+
+    def masque(self, modalite=None, **criteres):
+        """
+        Tableau booléen des événements retenus
+        criteres : ceux de Calendrier.numeros() (groupe, ressource, mois, salle, professeur)
+        Exemple: masque(modalite='TP', groupe='RT1-A1')
+        """
+        if criteres:
+            selection = np.zeros(len(self), dtype=bool)
+            selection[self.calendrier.numeros(**criteres)] = True
+        else:
+            selection = np.ones(len(self), dtype=bool)
+        if modalite is not None:
+            if modalite not in self.categories['modalite']:
+                return np.zeros(len(self), dtype=bool)
+            selection &= self.modalite == self.categories['modalite'].index(modalite)
+        return selection
+
+    def dimension(self, nom):
+        """
+        Retourne (numéros d'événements, codes, étiquettes) d'une dimension de regroupement
+        nom : 'mois' (AAAA-MM), 'semaine' (date du lundi, AAAA-MM-JJ), 'ressource', 'modalite',
+              'groupe', 'salle' ou 'professeur'
+        """
+        if nom in ('ressource', 'modalite'):
+            return np.arange(len(self)), getattr(self, nom), self.categories[nom]
+        if nom in self.liens:
+            numeros, codes = self.liens[nom]
+            return numeros, codes, self.categories[nom]
+        if nom not in ('mois', 'semaine'):
+            raise ValueError(f"Dimension inconnue : {nom}")
+
+        numeros = np.flatnonzero(~np.isnat(self.debut))
+        if nom == 'mois':
+            periodes = self.debut[numeros].astype('datetime64[M]')
+        else:
+            # Le jour 0 de NumPy (1er janvier 1970) est un jeudi : on recule jusqu'au lundi de la semaine
+            jours = self.debut[numeros].astype('datetime64[D]')
+            periodes = jours - ((jours.astype(np.int64) + 3) % 7).astype('timedelta64[D]')
+        etiquettes, codes = np.unique(periodes, return_inverse=True)
+        return numeros, codes, np.datetime_as_string(etiquettes).tolist()
+
+    def regrouper(self, dimension, poids=None, masque=None):
+        """
+        Somme de poids (un par événement) pour chaque valeur d'une dimension ; sans poids, compte les événements
+        Retourne un dict {étiquette: total} limité aux valeurs non nulles, dans l'ordre des étiquettes
+        """
+        numeros, codes, etiquettes = self.dimension(dimension)
+        if masque is not None:
+            retenus = masque[numeros]
+            numeros, codes = numeros[retenus], codes[retenus]
+        totaux = np.bincount(codes, weights=None if poids is None else poids[numeros], minlength=len(etiquettes))
+        return {etiquette: total for etiquette, total in zip(etiquettes, totaux.tolist()) if total}
+
+    def heures_par(self, dimension, masque=None):
+        """Heures de cours par valeur d'une dimension (ex: heures_par('professeur'))"""
+        return self.regrouper(dimension, self.duree, masque)
+
+    def seances_par(self, dimension, masque=None):
+        """Nombre de séances par valeur d'une dimension (ex: seances_par('mois', masque(modalite='TP')))"""
+        return self.regrouper(dimension, None, masque)
+
+
+def compter_seances_par_mois(source, groupe, modalite='TP'):
+    """
+    Nombre de séances d'une modalité par mois pour un groupe, calculé sur les tableaux
+    Retourne un Counter {'Septembre': 12, ...} comme compter_tp_par_mois (python 3.py et python 4.py)
+    """
+    tableaux = TableauxCalendrier.depuis(source)
+    if tableaux is None:
+        return None
+    compteur = Counter()
+    for mois, nombre in tableaux.seances_par('mois', tableaux.masque(modalite=modalite, groupe=groupe)).items():
+        compteur[extraire_mois_de_date(f"01-{mois[5:7]}-{mois[0:4]}")] += nombre
+    return compteur
+
+
+def afficher_totaux(titre, totaux, unite):
+    """Affiche un dict {étiquette: total} trié par total décroissant"""
+    print(f"\n=== {titre} ===")
+    for etiquette, total in sorted(totaux.items(), key=lambda paire: -paire[1]):
+        print(f"  {etiquette:<30} {total:8.1f} {unite}")
+
+
+# Programme principal
+if __name__ == "__main__":
+    if not numpy_disponible():
+        print("Le module numpy n'est pas installé : python -m pip install numpy")
+    else:
+        tableaux = TableauxCalendrier.depuis("ADE_RT1_Septembre2025_Decembre2025.ics")
+        if tableaux is not None:
+            print(f"{len(tableaux)} événement(s), {tableaux.duree.sum():.1f} h au total")
+            afficher_totaux("Heures par mois", tableaux.heures_par('mois'), "h")
+            afficher_totaux("Heures par semaine", tableaux.heures_par('semaine'), "h")
+            afficher_totaux("Heures par modalité", tableaux.heures_par('modalite'), "h")
+            afficher_totaux("Heures par professeur", tableaux.heures_par('professeur'), "h")
+            afficher_totaux("Heures par salle", tableaux.heures_par('salle'), "h")